@@ -2,23 +2,61 @@ __version__ = "0.1.2"
 
 import logging
 
+from .admission import ConcurrencyLimit
 from .app import SanicBoom
+from .background import BackgroundTasks, TaskQueue
 from .cache import CacheEngine
-from .component import Component, ComponentCache
+from .component import BatchComponent, Component, ComponentCache
+from .deadline import Deadline, with_deadline
+from .executors import ProcessPool, ThreadPool, run_in_process, run_in_thread
+from .metrics import Metrics
+from .monitor import LoopMonitor
+from .profiler import SamplingProfiler
+from .ratelimit import RateLimit
 from .request import BoomRequest
 from .resolver import Resolver
+from .response_cache import (
+    CachePolicy,
+    ResponseCache,
+    cache_response,
+    coalesce_requests,
+)
 from .router import BoomRouter
+from .slowlog import SlowRequestLog
+from .tracing import Span, Trace, Tracer
 from .utils import param_parser
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 __all__ = (
+    "BackgroundTasks",
+    "BatchComponent",
     "BoomRequest",
     "BoomRouter",
+    "cache_response",
     "CacheEngine",
+    "CachePolicy",
+    "coalesce_requests",
     "Component",
     "ComponentCache",
+    "ConcurrencyLimit",
+    "Deadline",
+    "LoopMonitor",
+    "Metrics",
     "param_parser",
+    "ProcessPool",
+    "RateLimit",
     "Resolver",
+    "ResponseCache",
+    "run_in_process",
+    "run_in_thread",
+    "SamplingProfiler",
     "SanicBoom",
+    "SlowRequestLog",
+    "Span",
+    "TaskQueue",
+    "ThreadPool",
+    "Trace",
+    "Tracer",
+    "with_deadline",
 )
@@ -0,0 +1,84 @@
+from asyncio import CancelledError, TimeoutError, get_event_loop, wait_for
+from collections import deque
+
+from sanic.response import HTTPResponse
+
+
+class ConcurrencyLimit:
+    """Admission control for routes: at most ``limit`` requests are handled
+    at a time, with up to ``queue`` more waiting (for ``timeout`` seconds, at
+    most) for their turn. Anything else gets a ``503`` right away, with a
+    ``Retry-After`` header, before any component is resolved.
+
+    Instances decorate handlers; decorating many handlers with the same
+    instance limits them as a group.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        queue: int = 0,
+        timeout: float = None,
+        retry_after: int = 1,
+    ):
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.rejected = 0
+        self._waiters = deque()
+
+    def __call__(self, handler):
+        handler.concurrency_limit = self
+        return handler
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+
+        if len(self._waiters) >= self.queue:
+            self.rejected += 1
+            return False
+
+        future = get_event_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await wait_for(future, self.timeout)
+        except TimeoutError:
+            self.rejected += 1
+            return False
+        except CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # it was handed over already
+            raise
+        finally:
+            if not future.done() or future.cancelled():
+                try:
+                    self._waiters.remove(future)
+                except ValueError:
+                    pass
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)  # the slot goes to the next one
+                return
+        self.active -= 1
+
+    def rejected_response(self) -> HTTPResponse:
+        return HTTPResponse(
+            "Service Unavailable",
+            status=503,
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+__all__ = ("ConcurrencyLimit",)
@@ -1,7 +1,10 @@
-import re
+import gc
+import sys
+import typing as t
 import warnings
-from asyncio import CancelledError
+from asyncio import CancelledError, Task, get_event_loop, shield, sleep, wait
 from inspect import isawaitable
+from time import perf_counter
 from traceback import format_exc
 from urllib.parse import urlencode, urlunparse
 
@@ -9,16 +12,50 @@ from sanic import Sanic
 from sanic.constants import HTTP_METHODS
 from sanic.exceptions import SanicException, URLBuildError
 from sanic.log import error_logger
-from sanic.response import HTTPResponse, StreamingHTTPResponse
+from sanic.response import HTTPResponse, StreamingHTTPResponse, json
+from sanic.server import HttpProtocol
+from sanic.websocket import WebSocketProtocol
 
+from sanic_boom import executors, lifespan, tracing
+from sanic_boom.background import (
+    REQUEST_BACKGROUND_KEY,
+    BackgroundTasksComponent,
+    TaskQueue,
+)
 from sanic_boom.cache import CacheEngine
 from sanic_boom.component import Component
+from sanic_boom.deadline import Deadline
+from sanic_boom.exceptions import DeadlineExceeded
+from sanic_boom.executors import (
+    DEFAULT_EXECUTOR,
+    PROCESS_EXECUTOR,
+    ProcessPool,
+    ThreadPool,
+)
+from sanic_boom.metrics import DEFAULT_BUCKETS, Metrics
+from sanic_boom.monitor import LoopMonitor
+from sanic_boom.profiler import SamplingProfiler
+from sanic_boom.protocol import BoomHttpProtocol, BoomWebSocketProtocol
+from sanic_boom.ratelimit import client_address
 from sanic_boom.references import DOC_LINKS as dl
 from sanic_boom.request import BoomRequest
 from sanic_boom.resolver import Resolver
+from sanic_boom.response_cache import (
+    CACHEABLE_METHODS,
+    CachedResponse,
+    ResponseCache,
+    shareable,
+)
 from sanic_boom.router import BoomRouter
-from sanic_boom.utils import param_parser
-from sanic_boom.wrappers import MiddlewareType
+from sanic_boom.slowlog import SlowRequestLog
+from sanic_boom.tracing import Trace, Tracer
+from sanic_boom.utils import REQUEST_TEARDOWN_KEY, param_parser
+from sanic_boom.wrappers import MiddlewareType, Route
+
+try:
+    from asyncio import current_task
+except ImportError:  # Python 3.6
+    current_task = Task.current_task
 
 
 class SanicBoom(Sanic):
@@ -35,15 +72,365 @@ class SanicBoom(Sanic):
         param_parser_callable = kwargs.pop("param_parser", param_parser)
         super().__init__(*args, **kwargs)
         self.param_parser = param_parser_callable
+        self.tracers = []
+        self.metrics = None
+        self._metrics_task = None
+        self.profiler = None
+        self.slow_log = None
+        self.loop_monitor = None
+        self.response_cache = None
+        self._in_flight = {}
+        self.executors = {}
+        self._started_components = []
+        self._teardown_tasks = set()
+        self.background_tasks = None
+        self._options_headers = {}
         self.resolver = resolver_cls(self)
         self.cache_engine = cache_engine_cls(self)
 
         for component in components:
             self.add_component(component)
 
+        self.register_listener(self._start_components, "before_server_start")
+        self.register_listener(self._stop_components, "after_server_stop")
+        self.register_listener(self._start_executors, "after_server_start")
+        self.register_listener(self._shutdown_executors, "after_server_stop")
+        # (stop listeners run in reverse order, so this one is the first)
+        self.register_listener(self._finish_teardowns, "after_server_stop")
+
     def add_component(self, component: Component):
         self.resolver.add_component(component)
 
+    async def _start_components(self, app, loop):
+        self._started_components = await lifespan.startup(
+            self.resolver.components
+        )
+
+    async def _stop_components(self, app, loop):
+        started, self._started_components = self._started_components, []
+        await lifespan.shutdown(started)
+
+    def add_executor(
+        self,
+        name: str,
+        max_workers: int = None,
+        max_queue: int = None,
+        pool_cls: t.Type[ThreadPool] = ThreadPool,
+    ) -> ThreadPool:
+        """Add a named thread pool (or :class:`ProcessPool`, with
+        ``pool_cls``) to run synchronous handlers (decorated with
+        :func:`run_in_thread` or :func:`run_in_process`) and components (with
+        an ``executor``) in. Calls beyond ``max_workers`` wait in a queue; if
+        ``max_queue`` calls are already waiting, new ones are rejected with a
+        ``503``. The ``default`` (threads) and ``processes`` executors are
+        added when first needed, configured by ``BOOM_EXECUTOR_WORKERS`` and
+        ``BOOM_EXECUTOR_QUEUE`` or ``BOOM_PROCESS_WORKERS`` and
+        ``BOOM_PROCESS_QUEUE``, respectively.
+        """
+        executor = pool_cls(name, max_workers, max_queue)
+        self.executors[name] = executor
+        return executor
+
+    def get_executor(self, name: str = DEFAULT_EXECUTOR) -> ThreadPool:
+        executor = self.executors.get(name)
+        if executor is not None:
+            return executor
+        if name == DEFAULT_EXECUTOR:
+            return self.add_executor(
+                name,
+                self.config.get("BOOM_EXECUTOR_WORKERS"),
+                self.config.get("BOOM_EXECUTOR_QUEUE"),
+            )
+        if name == PROCESS_EXECUTOR:
+            return self.add_executor(
+                name,
+                self.config.get("BOOM_PROCESS_WORKERS"),
+                self.config.get("BOOM_PROCESS_QUEUE"),
+                pool_cls=ProcessPool,
+            )
+        raise ValueError('Executor "{}" was never added'.format(name))
+
+    def _start_executors(self, app, loop):
+        # started by each worker, so processes are not forked from forks
+        for executor in self.executors.values():
+            if isinstance(executor, ProcessPool):
+                executor.start()
+
+    def _shutdown_executors(self, app, loop):
+        for executor in self.executors.values():
+            executor.shutdown()
+
+    def add_tracer(self, tracer: Tracer):
+        """Enable tracing of every request, with spans for each stage of
+        :meth:`handle_request`, sent to ``tracer`` when they are finished.
+        """
+        self.tracers.append(tracer)
+
+    def swap_router(self, router: BoomRouter, clean_cache: bool = True):
+        """Atomically put a new route table (built off to the side, usually
+        from :meth:`BoomRouter.clone`) in place, while requests are being
+        served. Only the cached data of routes and middlewares that are gone
+        is invalidated (component caches only with ``clean_cache``).
+        """
+        gone = self.router.swap(router)
+        for item in gone:
+            handlers = getattr(item.handler, "handlers", None)
+            for handler in (handlers or {None: item.handler}).values():
+                # plans are always dropped, or handlers created on the fly
+                # (closures, for instance) would pile up in the resolver
+                self.resolver.invalidate(handler)
+                if clean_cache:
+                    self.cache_engine.invalidate(handler)
+            rate_limit = getattr(item, "rate_limit", None)
+            if rate_limit is not None:
+                self.resolver.invalidate(rate_limit.key)
+        self.freeze()
+
+    def enable_metrics(
+        self,
+        uri: str = None,
+        buckets: t.Sequence[float] = DEFAULT_BUCKETS,
+        directory: str = None,
+        interval: float = 5.0,
+    ):
+        """Count requests (by status class) and their latency, per route
+        template and method. If ``uri`` is given, a route is added to expose
+        them in the Prometheus text format. With multiple workers, set
+        ``directory`` (shared by all of them) so each worker dumps its own
+        metrics there every ``interval`` seconds, and any worker can expose
+        all of them.
+        """
+        self.metrics = Metrics(buckets=buckets, directory=directory)
+
+        if uri is not None:
+
+            async def metrics_handler():
+                text = self.metrics.render()
+                if self.executors:
+                    text += executors.render(self.executors.values())
+                if self.background_tasks is not None:
+                    text += self.background_tasks.render()
+                return HTTPResponse(
+                    text, content_type="text/plain; version=0.0.4"
+                )
+
+            self.route(uri, name="sanic_boom.metrics")(metrics_handler)
+
+        if directory is not None:
+
+            async def dump_metrics():
+                while True:
+                    await sleep(interval)
+                    self.metrics.dump()
+
+            def start_dumping(app, loop):
+                self._metrics_task = loop.create_task(dump_metrics())
+
+            def stop_dumping(app, loop):
+                if self._metrics_task is not None:
+                    self._metrics_task.cancel()
+                self.metrics.dump()
+
+            self.register_listener(start_dumping, "after_server_start")
+            self.register_listener(stop_dumping, "before_server_stop")
+
+    def enable_profiler(self, uri: str = None, interval: float = 0.005):
+        """Setup a sampling profiler for the event loop thread, which starts
+        with the server if ``BOOM_PROFILER`` is set in the configuration. If
+        ``uri`` is given, routes are added to get the samples (in the
+        collapsed stack format, optionally for a single ``route``, like
+        ``?route=GET /search``) and to ``POST`` to ``uri/start``,
+        ``uri/stop`` and ``uri/reset`` - protect them with a middleware!
+        """
+        self.profiler = SamplingProfiler(interval=interval)
+
+        if uri is not None:
+            uri = uri.rstrip("/")
+
+            async def profiler_handler(request):
+                return HTTPResponse(
+                    self.profiler.collapsed(request.args.get("route"))
+                )
+
+            async def profiler_action_handler(action):
+                getattr(self.profiler, action)()
+                return HTTPResponse(status=204)
+
+            self.route(uri, name="sanic_boom.profiler")(profiler_handler)
+            self.route(
+                uri + "/:action<start|stop|reset>",
+                methods=["POST"],
+                name="sanic_boom.profiler_action",
+            )(profiler_action_handler)
+
+        def start_profiler(app, loop):
+            if self.config.get("BOOM_PROFILER", False):
+                self.profiler.start()
+
+        def stop_profiler(app, loop):
+            self.profiler.stop()
+
+        self.register_listener(start_profiler, "after_server_start")
+        self.register_listener(stop_profiler, "before_server_stop")
+
+    def enable_slow_log(
+        self, threshold: float = None, size: int = 100, uri: str = None
+    ):
+        """Keep the last ``size`` requests slower than ``threshold`` seconds
+        (``BOOM_SLOW_REQUEST_THRESHOLD`` from the configuration, or one second
+        by default), with the timing of each stage and component. This
+        enables tracing for every request. If ``uri`` is given, a route is
+        added to read them, as JSON.
+        """
+        if threshold is None:
+            threshold = self.config.get("BOOM_SLOW_REQUEST_THRESHOLD", 1.0)
+        self.slow_log = SlowRequestLog(threshold=threshold, size=size)
+        self.add_tracer(self.slow_log)
+
+        if uri is not None:
+
+            async def slow_log_handler():
+                return json(list(self.slow_log.entries))
+
+            self.route(uri, name="sanic_boom.slow_log")(slow_log_handler)
+
+    def enable_loop_monitor(
+        self, threshold: float = None, interval: float = 0.05
+    ):
+        """Measure the event loop lag continuously, reporting (as warnings in
+        the log) the route and component executing whenever the loop is
+        blocked for ``threshold`` seconds (``BOOM_LOOP_BLOCK_THRESHOLD`` from
+        the configuration, or ``0.1`` by default) or more.
+        """
+        if threshold is None:
+            threshold = self.config.get("BOOM_LOOP_BLOCK_THRESHOLD", 0.1)
+        self.loop_monitor = LoopMonitor(threshold=threshold, interval=interval)
+
+        def start_loop_monitor(app, loop):
+            self.loop_monitor.start(loop)
+
+        def stop_loop_monitor(app, loop):
+            self.loop_monitor.stop()
+
+        self.register_listener(start_loop_monitor, "after_server_start")
+        self.register_listener(stop_loop_monitor, "before_server_stop")
+
+    def enable_background_tasks(
+        self,
+        concurrency: int = None,
+        max_size: int = None,
+        drain_timeout: float = None,
+    ):
+        """Let handlers (and middlewares) schedule work to be done after the
+        response is written, through a parameter annotated with
+        :class:`BackgroundTasks`. Tasks run in a :class:`TaskQueue` with
+        ``concurrency`` (``BOOM_BACKGROUND_CONCURRENCY``, or 10) workers and
+        room for ``max_size`` (``BOOM_BACKGROUND_QUEUE``, or 1000) waiting
+        tasks. When the server stops, pending tasks get ``drain_timeout``
+        (``BOOM_BACKGROUND_DRAIN_TIMEOUT``, or 30) seconds to finish.
+        """
+        if concurrency is None:
+            concurrency = self.config.get("BOOM_BACKGROUND_CONCURRENCY", 10)
+        if max_size is None:
+            max_size = self.config.get("BOOM_BACKGROUND_QUEUE", 1000)
+        if drain_timeout is None:
+            drain_timeout = self.config.get(
+                "BOOM_BACKGROUND_DRAIN_TIMEOUT", 30
+            )
+        self.background_tasks = TaskQueue(
+            concurrency=concurrency, max_size=max_size
+        )
+        self.add_component(BackgroundTasksComponent)
+
+        def start_background_tasks(app, loop):
+            self.background_tasks.start(loop)
+
+        async def stop_background_tasks(app, loop):
+            await self.background_tasks.stop(drain_timeout)
+
+        self.register_listener(start_background_tasks, "after_server_start")
+        self.register_listener(stop_background_tasks, "after_server_stop")
+
+    def freeze(self, gc_freeze: bool = False):
+        """Compute everything that can be computed before serving requests,
+        like the resolution plan of each handler and middleware. This is
+        called by the server (once, in the main process) before workers are
+        started; with ``gc_freeze``, all objects created so far are moved out
+        of the garbage collector reach, so forked workers can keep sharing
+        them (copy-on-write) instead of each one paying for it again.
+        """
+        handlers = list(self.request_middleware)
+        handlers.extend(self.response_middleware)
+        handlers.extend(m.handler for m in self.router.middlewares)
+
+        for route in self.router.routes:
+            if hasattr(route.handler, "handlers"):
+                handlers.extend(route.handler.handlers.values())
+            else:
+                handlers.append(route.handler)
+
+        for handler in handlers:
+            try:
+                self.resolver.compile(handler)
+            except (TypeError, ValueError):
+                # not our business, it will fail (again) when requested
+                continue
+
+        for route in self.router.routes:
+            route.rate_limit = getattr(route.handler, "rate_limit", None)
+            if route.rate_limit is not None:
+                try:
+                    self.resolver.compile(route.rate_limit.key)
+                except (TypeError, ValueError):
+                    pass
+            route.fast_path = None
+            route.cache_policy = None
+            route.coalesce_policy = None
+            route.offload = None
+            route.concurrency_limit = getattr(
+                route.handler, "concurrency_limit", None
+            )
+            route.deadline = getattr(
+                route.handler, "deadline", self.config.get("BOOM_DEADLINE")
+            )
+            if hasattr(route.handler, "handlers"):
+                continue
+            route.cache_policy = getattr(route.handler, "cache_policy", None)
+            route.coalesce_policy = getattr(
+                route.handler, "coalesce_policy", None
+            )
+            if route.cache_policy is not None and self.response_cache is None:
+                self.response_cache = ResponseCache(
+                    self.config.get("BOOM_RESPONSE_CACHE_SIZE", 1024)
+                )
+            route.offload = getattr(route.handler, "offload", None)
+            if route.offload is not None:
+                self.get_executor(route.offload.executor)
+            if route.cache_policy or route.coalesce_policy or route.offload:
+                # these are all handled by _handle
+                continue
+            converted = {name for name, _, _ in route.converters}
+            try:
+                route.fast_path = self.resolver.find_plain(
+                    route.handler, route.template.names, converted
+                )
+            except (TypeError, ValueError):
+                continue
+
+        if gc_freeze and hasattr(gc, "freeze"):
+            gc.collect()
+            gc.freeze()
+
+    def _helper(self, *args, **kwargs):
+        self.freeze(gc_freeze=kwargs.get("workers", 1) > 1)
+        # custom protocols are left alone (disconnects are not told apart)
+        protocol = kwargs.get("protocol", HttpProtocol)
+        if protocol is HttpProtocol:
+            kwargs["protocol"] = BoomHttpProtocol
+        elif protocol is WebSocketProtocol:
+            kwargs["protocol"] = BoomWebSocketProtocol
+        return super()._helper(*args, **kwargs)
+
     def url_for(
         self,
         view_name: str,
@@ -54,6 +441,32 @@ class SanicBoom(Sanic):
         _method: object = None,
         **kwargs
     ):
+        route, _scheme, _server = self._find_url_route(
+            view_name, _external, _scheme, _server
+        )
+        return self._build_url(route, _scheme, _server, _anchor, kwargs)
+
+    def urls_for(
+        self,
+        view_name: str,
+        values: t.Iterable[t.Dict[str, t.Any]],
+        _anchor: str = "",
+        _external: bool = False,
+        _scheme: str = "",
+        _server: str = None,
+    ) -> t.List[str]:
+        """Build many URLs for the same route at once, looking it up (and
+        sorting out the scheme and server) only one time.
+        """
+        route, _scheme, _server = self._find_url_route(
+            view_name, _external, _scheme, _server
+        )
+        return [
+            self._build_url(route, _scheme, _server, _anchor, kwargs)
+            for kwargs in values
+        ]
+
+    def _find_url_route(self, view_name, _external, _scheme, _server):
         # ? i think this should be in the Router
         uri, route = self.router.find_route_by_view_name(view_name)
 
@@ -66,7 +479,10 @@ class SanicBoom(Sanic):
             raise ValueError("When specifying _scheme, _external must be True")
 
         if _server is None and _external:
-            _server = self.config.get("SERVER_NAME", "")
+            if isinstance(route.host, str) and not route.host.startswith("*"):
+                _server = route.host
+            else:
+                _server = self.config.get("SERVER_NAME", "")
 
         if _external:
             if not _scheme:
@@ -78,34 +494,18 @@ class SanicBoom(Sanic):
             if "://" in _server[:8]:
                 _server = _server.split("://", 1)[-1]
 
-        orig_uri = uri
-        replaced_vars = []
+        return route, _scheme, _server
 
-        for k in kwargs:
-            if re.search(r"([:|\*])", str(kwargs[k])):
-                raise URLBuildError(
-                    "The parameter '{}' passed for URL `{}` with the value of "
-                    "'{}' may contain invalid characters that can break the "
-                    "URL".format(k, orig_uri, kwargs[k])
-                )
-
-            m = re.search(r"([:|\*]{})".format(k), uri)
-            if m:
-                replaced_vars.append(k)
-                uri = uri.replace(m.group(0), str(kwargs[k]))
-            # else log ?
+    def _build_url(self, route, _scheme, _server, _anchor, kwargs):
+        template = route.template
+        uri = template.build(kwargs)
+        query = {k: v for k, v in kwargs.items() if k not in template.names}
 
-        for k in replaced_vars:
-            del kwargs[k]
-
-        if uri.find(":") > -1 or uri.find("*") > -1:
-            raise URLBuildError(
-                "Required parameters for URL `{}` was not passed to "
-                "url_for".format(orig_uri)
-            )
+        if not (_scheme or _server or _anchor or query):
+            return uri
 
         # parse the remainder of the keyword arguments into a querystring
-        query_string = urlencode(kwargs, doseq=True) if kwargs else ""
+        query_string = urlencode(query, doseq=True) if query else ""
         # scheme://netloc/path;parameters?query#fragment
         return urlunparse((_scheme, _server, uri, "", query_string, _anchor))
 
@@ -122,7 +522,8 @@ class SanicBoom(Sanic):
         """Decorate a function to be registered as a route
         :param uri: path of the URL
         :param methods: list or tuple of methods allowed
-        :param host:
+        :param host: host (or list of hosts) this route is bound to, which
+            can also be a wildcard subdomain, like ``*.example.com``
         :param strict_slashes:
         :param stream:
         :param version:
@@ -143,7 +544,9 @@ class SanicBoom(Sanic):
         def response(handler):
             if stream:  # noqa I have no idea how to handle this right now
                 handler.is_stream = stream
-            self.router.add(uri, methods, handler, version=version, name=name)
+            self.router.add(
+                uri, methods, handler, host=host, version=version, name=name
+            )
             return handler
 
         return response
@@ -190,50 +593,161 @@ class SanicBoom(Sanic):
         self.router.add(**kwargs)
         return middleware
 
+    def _options_response(self, request):
+        allowed = self.router.allowed_methods(request)
+        if not allowed or "OPTIONS" in allowed:
+            # not found or there's an explicit handler for it
+            return None
+
+        headers = self._options_headers.get(allowed)
+        if headers is None:
+            allow = ", ".join(sorted(allowed | {"OPTIONS"}))
+            headers = self._options_headers[allowed] = {"Allow": allow}
+
+        cors_origins = self.config.get("BOOM_CORS_ORIGINS")
+        origin = request.headers.get("Origin")
+        method = request.headers.get("Access-Control-Request-Method")
+
+        if cors_origins and origin and method in allowed:
+            if isinstance(cors_origins, str):
+                cors_origins = [o.strip() for o in cors_origins.split(",")]
+            # cors preflight request
+            headers = dict(headers)
+            if "*" in cors_origins:
+                headers["Access-Control-Allow-Origin"] = "*"
+            elif origin in cors_origins:
+                headers["Access-Control-Allow-Origin"] = origin
+                headers["Vary"] = "Origin"
+            else:
+                return HTTPResponse(status=204, headers=headers)
+            headers["Access-Control-Allow-Methods"] = headers["Allow"]
+            allow_headers = self.config.get(
+                "BOOM_CORS_ALLOW_HEADERS",
+                request.headers.get("Access-Control-Request-Headers"),
+            )
+            if allow_headers:
+                headers["Access-Control-Allow-Headers"] = allow_headers
+            max_age = self.config.get("BOOM_CORS_MAX_AGE")
+            if max_age is not None:
+                headers["Access-Control-Max-Age"] = str(max_age)
+
+        return HTTPResponse(status=204, headers=headers)
+
     async def handle_request(self, request, write_callback, stream_callback):
         # Define `response` var here to remove warnings about
         # allocation before assignment below.
         response = None
         cancelled = False
         middlewares = []
+        request.app = self
+        trace = None
+        frame = None
+        limit = None
+        started = perf_counter() if self.metrics is not None else None
+        observed = (
+            started is not None
+            or self.tracers
+            or (self.profiler is not None and self.profiler.running)
+        )
+
+        if self.tracers:
+            trace = request.trace = Trace(request.method, request.path)
+            for tracer in self.tracers:
+                try:
+                    tracer.on_start(trace, request)
+                except Exception:
+                    error_logger.exception(
+                        "Exception occurred in tracer {!r}".format(tracer)
+                    )
+
+        if request.method == "OPTIONS" and self.config.get(
+            "BOOM_AUTO_OPTIONS", False
+        ):
+            # automatic (and preflight) responses don't even get to the
+            # middlewares or the resolver, that's why they are opt-in
+            response = self._options_response(request)
+            if response is not None:
+                write_callback(response)
+                if observed:
+                    self._finish_request(request, response, started, frame)
+                return
+
         try:
             # --------------------------------------------------------------- #
             # request "global" middlewares
             # --------------------------------------------------------------- #
-            request.app = self
             if self.request_middleware:
+                if trace is not None:
+                    trace.enter(tracing.REQUEST_MIDDLEWARE)
                 response = await self._run_request_middleware(
                     request, self.request_middleware
                 )
             # No middleware result
             if not response:
                 # Fetch handler from router
-                handler, middlewares, kwargs, uri = self.router.get(request)
-                request.uri_template = uri
-                # handler = self.request.route_handlers.endpoint
-                # middlewares = self.request.route_handlers.middlewares
-                # kwargs = self.request.route_params
-
-                # run layered request middlewares
-                request_middleware = [
-                    m.handler
-                    for m in middlewares
-                    if m.attach_to == MiddlewareType.REQUEST
-                ]
-
-                if request_middleware:
-                    response = await self._run_request_middleware(
-                        request, request_middleware
+                if trace is not None:
+                    trace.enter(tracing.ROUTING)
+                route, handler, middlewares, kwargs = self.router.get(request)
+                request.uri_template = route.uri
+                if observed:
+                    if trace is not None:
+                        trace.span.attributes["uri_template"] = route.uri
+                    if self.profiler is not None and self.profiler.running:
+                        frame = sys._getframe()
+                        self.profiler.enter(
+                            frame, "{} {}".format(request.method, route.uri)
+                        )
+
+                throttled = None
+                if route.rate_limit is not None:
+                    throttled = await self._throttle(
+                        request, route.rate_limit, kwargs
                     )
 
-                if not response:
-                    # run response handler
-                    ret = await self.resolver.resolve(
-                        request=request, func=handler, prefetched=kwargs
+                shed = False
+                if throttled is None and route.concurrency_limit is not None:
+                    if await route.concurrency_limit.acquire():
+                        limit = route.concurrency_limit  # to be released
+                    else:
+                        shed = True
+
+                if throttled is not None:
+                    response = throttled
+                elif shed:
+                    # load shedding, as fast as possible
+                    response = route.concurrency_limit.rejected_response()
+                elif route.deadline is not None:
+                    request.deadline = deadline = Deadline(route.deadline)
+                    # this very task is cancelled (instead of running in
+                    # another one), so the monitor and the profiler still
+                    # find the route in this frame
+                    timer = deadline.enforce(current_task())
+                    try:
+                        if route.fast_path is not None and not middlewares:
+                            response = await self._call_plain(
+                                request, route, handler, kwargs
+                            )
+                        else:
+                            response = await self._handle(
+                                request, route, handler, middlewares, kwargs
+                            )
+                    except CancelledError:
+                        if not deadline.exceeded:
+                            raise
+                        raise DeadlineExceeded(
+                            "Deadline of {}s exceeded".format(route.deadline)
+                        )
+                    finally:
+                        timer.cancel()
+                elif route.fast_path is not None and not middlewares:
+                    # nothing to be resolved, just call the handler
+                    response = await self._call_plain(
+                        request, route, handler, kwargs
+                    )
+                else:
+                    response = await self._handle(
+                        request, route, handler, middlewares, kwargs
                     )
-                    response = handler(**ret)
-                    if isawaitable(response):
-                        response = await response
         except CancelledError:
             # If response handler times out, the server handles the error
             # and cancels the handle_request job.
@@ -245,6 +759,8 @@ class SanicBoom(Sanic):
             # -------------------------------------------- #
             # Response Generation Failed
             # -------------------------------------------- #
+            if trace is not None:
+                trace.span.attributes["exception"] = type(e).__name__
 
             try:
                 response = self.error_handler.response(request, e)
@@ -267,6 +783,8 @@ class SanicBoom(Sanic):
                         "An error occurred while handling an error", status=500
                     )
         finally:
+            if limit is not None:
+                limit.release()
             # --------------------------------------------------------------- #
             # Response Middleware
             # --------------------------------------------------------------- #
@@ -274,17 +792,21 @@ class SanicBoom(Sanic):
             if response is not None:
                 try:
                     if self.response_middleware:
+                        if trace is not None:
+                            trace.enter(tracing.RESPONSE_MIDDLEWARE)
                         response = await self._run_response_middleware(
                             request, response, self.response_middleware
                         )
                     # run layered response middlewares
-                    response_middleware = [
+                    response_middleware = middlewares and [
                         m.handler
                         for m in middlewares
                         if m.attach_to == MiddlewareType.RESPONSE
                     ]
 
                     if response_middleware:
+                        if trace is not None:
+                            trace.enter(tracing.LAYERED_RESPONSE_MIDDLEWARE)
                         response = await self._run_response_middleware(
                             request, response, response_middleware
                         )
@@ -299,13 +821,207 @@ class SanicBoom(Sanic):
                         "middleware handlers"
                     )
             if cancelled:
+                if trace is not None:
+                    trace.span.attributes["cancelled"] = True
+                if observed:
+                    self._finish_request(request, None, started, frame)
+                if REQUEST_TEARDOWN_KEY in request:
+                    await self._teardown(request)
                 raise CancelledError()
 
         # pass the response to the correct callback
+        if trace is not None:
+            trace.enter(tracing.WRITE)
         if isinstance(response, StreamingHTTPResponse):  # noqa copied code
             await stream_callback(response)
         else:
             write_callback(response)
+        if observed:
+            self._finish_request(request, response, started, frame)
+        if REQUEST_BACKGROUND_KEY in request:
+            for task in request.pop(REQUEST_BACKGROUND_KEY).tasks:
+                self.background_tasks.submit(task)
+        if REQUEST_TEARDOWN_KEY in request:
+            await self._teardown(request)
+
+    async def _teardown(self, request):
+        generators = request.pop(REQUEST_TEARDOWN_KEY)
+        task = get_event_loop().create_task(
+            self.cache_engine.teardown(generators)
+        )
+        self._teardown_tasks.add(task)
+        task.add_done_callback(self._teardown_tasks.discard)
+        if len(self._teardown_tasks) > self.config.get(
+            "BOOM_TEARDOWN_TASKS", 100
+        ):
+            # too many of them running in the background already
+            await shield(task)
+
+    async def _finish_teardowns(self, app, loop):
+        if self._teardown_tasks:
+            await wait(list(self._teardown_tasks))
+
+    def _finish_request(self, request, response, started, frame):
+        if frame is not None:
+            self.profiler.leave(frame)
+
+        trace = request.trace
+        # set by the protocol, when the client is gone
+        disconnected = response is None and request.disconnected
+
+        if started is not None:
+            self.metrics.observe(
+                request.uri_template,
+                request.method,
+                None if response is None else response.status,
+                perf_counter() - started,
+                disconnected,
+            )
+
+        if trace is None:
+            return
+        if disconnected:
+            trace.span.attributes["disconnected"] = True
+        trace.finish()
+        if response is not None:
+            trace.span.attributes["status"] = response.status
+        for tracer in self.tracers:
+            try:
+                tracer.on_finish(trace, request, response)
+            except Exception:
+                error_logger.exception(
+                    "Exception occurred in tracer {!r}".format(tracer)
+                )
+
+    async def _throttle(self, request, rate_limit, kwargs):
+        key = rate_limit.key
+        if key is client_address:
+            value = key(request)
+        else:
+            value = key(
+                **await self.resolver.resolve(
+                    request=request, func=key, prefetched=kwargs
+                )
+            )
+            if isawaitable(value):
+                value = await value
+        if value is None:
+            return None
+        wait = rate_limit.take(value)
+        if wait:
+            return rate_limit.rejected_response(wait)
+        return None
+
+    async def _call_plain(self, request, route, handler, kwargs):
+        # the fast path: nothing to be resolved, just call the handler
+        if request.trace is not None:
+            request.trace.enter(tracing.HANDLER)
+        if route.fast_path:
+            kwargs = dict(kwargs)
+            for name in route.fast_path:
+                kwargs[name] = request
+        response = handler(**kwargs)
+        if isawaitable(response):
+            response = await response
+        return response
+
+    async def _handle(self, request, route, handler, middlewares, kwargs):
+        response = None
+        trace = request.trace
+        # run layered request middlewares
+        request_middleware = [
+            m.handler
+            for m in middlewares
+            if m.attach_to == MiddlewareType.REQUEST
+        ]
+
+        if request_middleware:
+            if trace is not None:
+                trace.enter(tracing.LAYERED_REQUEST_MIDDLEWARE)
+            response = await self._run_request_middleware(
+                request, request_middleware
+            )
+
+        if response:
+            return response
+
+        policy = route.cache_policy
+        if policy is not None and request.method in CACHEABLE_METHODS:
+            key = policy.key(request, route, kwargs)
+            response = self.response_cache.get(request, key)
+            if response is not None:
+                return response
+        else:
+            policy = None
+
+        if (
+            route.coalesce_policy is not None
+            and request.method in CACHEABLE_METHODS
+        ):
+            response = await self._coalesce(request, route, handler, kwargs)
+        else:
+            response = await self._call_handler(
+                request, route, handler, kwargs
+            )
+        if policy is not None:
+            response = self.response_cache.put(request, key, policy, response)
+        return response
+
+    async def _call_handler(self, request, route, handler, kwargs):
+        trace = request.trace
+        if trace is not None:
+            trace.enter(tracing.RESOLVE)
+        ret = await self.resolver.resolve(
+            request=request, func=handler, prefetched=kwargs
+        )
+        if trace is not None:
+            trace.enter(tracing.HANDLER)
+        if route.offload is not None:
+            response = await route.offload.run(
+                self.get_executor(route.offload.executor), handler, ret
+            )
+        else:
+            response = handler(**ret)
+        if isawaitable(response):
+            response = await response
+        return response
+
+    async def _coalesce(self, request, route, handler, kwargs):
+        key = route.coalesce_policy.key(request, route, kwargs)
+        future = self._in_flight.get(key)
+
+        if future is not None:
+            try:
+                shared = await shield(future)
+            except CancelledError:
+                if not future.cancelled():
+                    raise  # this request was cancelled, not the other one
+                shared = None
+            if shared is not None:
+                return shared.response()
+            # the response could not be shared (or was never produced)
+            return await self._call_handler(request, route, handler, kwargs)
+
+        future = self._in_flight[key] = get_event_loop().create_future()
+        try:
+            response = await self._call_handler(
+                request, route, handler, kwargs
+            )
+        except CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # no need to warn if there are no followers
+            raise
+        else:
+            # followers call the handler themselves if it can't be shared
+            future.set_result(
+                CachedResponse(response) if shareable(response) else None
+            )
+        finally:
+            del self._in_flight[key]
+        return response
 
     async def _run_request_middleware(self, request, middlewares):
         for middleware in middlewares:
@@ -356,10 +1072,27 @@ class SanicBoom(Sanic):
         )
 
     def remove_route(self, uri, clean_cache=True, host=None):
-        warnings.warn(
-            "Removing routes is not available on 'sanic-boom' for design "
-            "reasons. Read more here: {}".format(
-                dl.get("SanicBoom.remove_route")
-            ),
-            RuntimeWarning,
+        uri = uri.strip()
+        if not uri.startswith("/"):
+            uri = "/" + uri
+        if uri.count("/") > 1 and uri[-1] == "/":
+            uri = uri[:-1]
+
+        def exclude(item):
+            return (
+                isinstance(item, Route)
+                and item.uri == uri
+                and (host is None or item.host == host)
+            )
+
+        if not any(exclude(route) for route in self.router.routes):
+            warnings.warn(
+                "There is no route registered for '{}' to be "
+                "removed".format(uri),
+                RuntimeWarning,
+            )
+            return
+
+        self.swap_router(
+            self.router.clone(exclude=exclude), clean_cache=clean_cache
         )
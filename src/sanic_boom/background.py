@@ -0,0 +1,147 @@
+import inspect
+import typing as t
+import uuid
+from asyncio import (
+    CancelledError,
+    Queue,
+    QueueFull,
+    TimeoutError,
+    gather,
+    wait_for,
+)
+from functools import partial
+from inspect import isawaitable
+
+from sanic.log import error_logger, logger
+
+from sanic_boom.component import Component
+from sanic_boom.metrics import render_stats
+
+REQUEST_BACKGROUND_KEY = "_sanic_boom_background_{!s}".format(uuid.uuid4())
+
+
+class BackgroundTasks:
+    """Work to be done after the response is written, added by handlers (or
+    middlewares) that ask for it as a parameter annotated with this class.
+    """
+
+    __slots__ = ("tasks",)
+
+    def __init__(self):
+        self.tasks = []
+
+    def add(self, func: t.Callable, *args, **kwargs) -> None:
+        self.tasks.append(partial(func, *args, **kwargs))
+
+
+class BackgroundTasksComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation is BackgroundTasks
+
+    async def get(self, request) -> BackgroundTasks:
+        tasks = request.get(REQUEST_BACKGROUND_KEY)
+        if tasks is None:
+            tasks = request[REQUEST_BACKGROUND_KEY] = BackgroundTasks()
+        return tasks
+
+
+class TaskQueue:
+    """Runs background tasks (functions or coroutine functions) in the event
+    loop, at most ``concurrency`` at a time. Up to ``max_size`` tasks wait
+    for their turn; beyond that, new ones are dropped (and counted as
+    rejected).
+    """
+
+    def __init__(self, concurrency: int = 10, max_size: int = 1000):
+        self.concurrency = concurrency
+        self.max_size = max_size
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._queue = None
+        self._workers = []
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self, loop) -> None:
+        if self._queue is not None:
+            return
+        self._queue = Queue(maxsize=self.max_size)
+        self._workers = [
+            loop.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
+    def submit(self, func: t.Callable, *args, **kwargs) -> bool:
+        if args or kwargs:
+            func = partial(func, *args, **kwargs)
+        try:
+            if self._queue is None:
+                raise QueueFull()
+            self._queue.put_nowait(func)
+        except QueueFull:
+            self.rejected += 1
+            logger.warning("Background task {!r} dropped".format(func))
+            return False
+        return True
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            func = await queue.get()
+            self.active += 1
+            try:
+                ret = func()
+                if isawaitable(ret):
+                    await ret
+            except CancelledError:
+                raise
+            except Exception:
+                self.failed += 1
+                error_logger.exception(
+                    "Exception occurred in background task {!r}".format(func)
+                )
+            else:
+                self.completed += 1
+            finally:
+                self.active -= 1
+                queue.task_done()
+
+    async def stop(self, timeout: float = None) -> None:
+        """Wait (up to ``timeout`` seconds) for the queue to be drained, then
+        stop the workers.
+        """
+        if self._queue is None:
+            return
+        try:
+            await wait_for(self._queue.join(), timeout)
+        except TimeoutError:
+            logger.warning(
+                "{} background tasks did not finish in time".format(
+                    self.queued + self.active
+                )
+            )
+        for worker in self._workers:
+            worker.cancel()
+        await gather(*self._workers, return_exceptions=True)
+        self._queue = None
+        self._workers = []
+
+    def render(self) -> str:
+        """Gauges and counters of the queue in the Prometheus text format."""
+        return render_stats(
+            "sanic_boom_background_",
+            (
+                ("active", "gauge", "Background tasks running"),
+                ("queued", "gauge", "Background tasks waiting to run"),
+                ("completed", "counter", "Background tasks finished"),
+                ("failed", "counter", "Background tasks that raised"),
+                ("rejected", "counter", "Background tasks dropped"),
+            ),
+            (({}, self),),
+        )
+
+
+__all__ = ("BackgroundTasks", "BackgroundTasksComponent", "TaskQueue")
@@ -1,14 +1,16 @@
 import inspect
 import typing as t
 import warnings
+from inspect import isasyncgen, isawaitable
 from threading import local as t_local
 
+from sanic.log import error_logger
 from sanic.request import Request
 
 from sanic_boom.component import Component, ComponentCache
 from sanic_boom.references import DOC_LINKS as dl
 from sanic_boom.request import BoomRequest
-from sanic_boom.utils import REQUEST_CACHE_KEY
+from sanic_boom.utils import REQUEST_CACHE_KEY, REQUEST_TEARDOWN_KEY
 
 
 class CacheEngine:
@@ -30,6 +32,66 @@ class CacheEngine:
         param: inspect.Parameter,
     ):
         lifecycle = component.get_cache_lifecycle()
+        trace = getattr(request, "trace", None)
+
+        if trace is None:
+            return await self._get(
+                component, lifecycle, endpoint, request, param
+            )
+
+        if lifecycle in (ComponentCache.NO_CACHE, ComponentCache.APP):
+            cache = "none"
+        elif self._is_cached(lifecycle, endpoint, request, param):
+            cache = "hit"
+        else:
+            cache = "miss"
+        span = trace.start(
+            "component",
+            component=type(component).__name__,
+            param=param.name,
+            lifecycle=lifecycle.name,
+            cache=cache,
+        )
+        try:
+            return await self._get(
+                component, lifecycle, endpoint, request, param
+            )
+        finally:
+            span.finish()
+
+    def invalidate(self, endpoint: t.Callable) -> None:
+        self._endpoints.pop(endpoint, None)
+
+    async def teardown(self, generators: t.List[t.AsyncGenerator]) -> None:
+        """Finish the generators of components (that ``yield`` their value)
+        resolved for a request, the last one first.
+        """
+        for generator in reversed(generators):
+            try:
+                await generator.__anext__()
+            except StopAsyncIteration:
+                continue
+            except Exception:
+                error_logger.exception(
+                    "Exception occurred in the teardown of a component"
+                )
+                continue
+            warnings.warn(
+                "Component generators should yield only once", RuntimeWarning
+            )
+            await generator.aclose()
+
+    # ----------------------------------------------------------------------- #
+    # "internal" methods
+
+    async def _get(
+        self,
+        component: Component,
+        lifecycle: ComponentCache,
+        endpoint: t.Callable,
+        request: t.Union[Request, BoomRequest],
+        param: inspect.Parameter,
+    ):
         value = None
 
         if lifecycle == ComponentCache.REQUEST:
@@ -46,8 +108,23 @@ class CacheEngine:
             return value
         return await self._resolve_param(component, request, param)
 
-    # ----------------------------------------------------------------------- #
-    # "internal" methods
+    def _is_cached(
+        self,
+        lifecycle: ComponentCache,
+        endpoint: t.Callable,
+        request: t.Union[Request, BoomRequest],
+        param: inspect.Parameter,
+    ) -> bool:
+        if lifecycle == ComponentCache.REQUEST:
+            return (
+                REQUEST_CACHE_KEY in request
+                and param in request[REQUEST_CACHE_KEY]
+            )
+        if lifecycle == ComponentCache.ENDPOINT:
+            return param in self._endpoints.get(endpoint, ())
+        if lifecycle == ComponentCache.CURRENT_THREAD:
+            return param in getattr(self._thread_local, "sanic_boom_cache", ())
+        return False
 
     async def _resolve_param(
         self,
@@ -58,7 +135,22 @@ class CacheEngine:
         kw = await self.app.resolver.resolve(
             request=request, func=component.get, source_param=param
         )
-        return await component.get(**kw)
+        if component.executor is None:
+            value = component.get(**kw)
+            if not isasyncgen(value):
+                return await value
+            # the rest of the generator runs after the response is written
+            generator = value
+            value = await generator.__anext__()
+            if REQUEST_TEARDOWN_KEY not in request:
+                request[REQUEST_TEARDOWN_KEY] = []
+            request[REQUEST_TEARDOWN_KEY].append(generator)
+            return value
+        executor = self.app.get_executor(component.executor)
+        value = await executor.run(component.get, **kw)
+        if isawaitable(value):
+            value = await value
+        return value
 
     async def _resolve_request(
         self,
@@ -1,4 +1,6 @@
 import inspect
+import typing as t
+from asyncio import get_event_loop, shield
 from enum import IntEnum
 
 
@@ -11,9 +13,24 @@ class ComponentCache(IntEnum):
 
 
 class Component:
+    # name of the executor (see SanicBoom.add_executor) to call "get" in, for
+    # components that block (like a synchronous database driver)
+    executor = None
+    # component classes that must be started before (and stopped after) this
+    depends_on = ()
+
     def __init__(self, app):
         self.app = app
 
+    async def startup(self):
+        """Called (once per worker) before the server starts, to setup any
+        resource the component needs, like a connection pool. Components that
+        are async context managers are entered instead.
+        """
+
+    async def shutdown(self):
+        """Called (once per worker) after the server stops."""
+
     def get_cache_lifecycle(self) -> ComponentCache:
         return ComponentCache.NO_CACHE
 
@@ -21,7 +38,85 @@ class Component:
         raise NotImplementedError  # noqa
 
     async def get(self, *args, **kwargs):
+        """The value of the component. If ``get`` is an async generator, the
+        value is the one it yields (only once), and the rest of it (like
+        releasing a connection back to the pool) runs after the response is
+        written, in the background - so, it can't be cached beyond the
+        request (such components are rejected by :meth:`Resolver.add_component`).
+        """
         raise NotImplementedError  # noqa
 
 
-__all__ = ("Component", "ComponentCache")
+class BatchComponent(Component):
+    """A component that loads its values by key, in batches: every
+    :meth:`load` (usually called from ``get``) in the same loop iteration (or
+    within ``batch_window`` seconds of the first one) is delivered to a single
+    :meth:`get_many` call, with at most ``max_batch_size`` keys. Values are
+    still cached according to :meth:`get_cache_lifecycle`.
+    """
+
+    batch_window = 0
+    max_batch_size = None
+
+    def __init__(self, app):
+        super().__init__(app)
+        self._batch = None
+
+    async def get_many(
+        self, keys: t.List[t.Hashable]
+    ) -> t.Union[t.Mapping[t.Hashable, t.Any], t.Sequence[t.Any]]:
+        """Values of all ``keys``, as a mapping (missing keys are ``None``)
+        or a sequence in the same order.
+        """
+        raise NotImplementedError  # noqa
+
+    async def load(self, key: t.Hashable) -> t.Any:
+        loop = get_event_loop()
+        batch = self._batch
+
+        if batch is None:
+            batch = self._batch = {}
+            if self.batch_window:
+                loop.call_later(self.batch_window, self._dispatch, batch)
+            else:
+                loop.call_soon(self._dispatch, batch)
+
+        future = batch.get(key)
+        if future is None:
+            future = batch[key] = loop.create_future()
+            if self.max_batch_size and len(batch) >= self.max_batch_size:
+                self._dispatch(batch)
+
+        # one cancelled request should not cancel the others
+        return await shield(future)
+
+    def _dispatch(self, batch: t.Dict[t.Hashable, t.Any]) -> None:
+        if self._batch is not batch:
+            return  # already dispatched, when full
+        self._batch = None
+        get_event_loop().create_task(self._load_many(batch))
+
+    async def _load_many(self, batch: t.Dict[t.Hashable, t.Any]) -> None:
+        keys = list(batch)
+        try:
+            values = await self.get_many(keys)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # the waiter may be gone
+            return
+        except BaseException:
+            # like a CancelledError: no waiter should be left hanging
+            for future in batch.values():
+                future.cancel()
+            raise
+
+        if not isinstance(values, t.Mapping):
+            values = dict(zip(keys, values))
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(values.get(key))
+
+
+__all__ = ("BatchComponent", "Component", "ComponentCache")
@@ -0,0 +1,69 @@
+from asyncio import Task, TimerHandle, get_event_loop
+from time import monotonic
+
+from sanic_boom.exceptions import DeadlineExceeded
+
+
+class Deadline:
+    """The time budget of a request, set per route with :func:`with_deadline`
+    (or ``BOOM_DEADLINE``, for all of them). Handlers and components get it
+    through a parameter annotated with this class, to skip optional work when
+    there is little time left.
+    """
+
+    __slots__ = ("timeout", "expires", "exceeded")
+
+    def __init__(self, timeout: float = None):
+        self.timeout = timeout
+        self.expires = None if timeout is None else monotonic() + timeout
+        self.exceeded = False  # set when the deadline cancels the request
+
+    @property
+    def remaining(self) -> float:
+        if self.expires is None:
+            return float("inf")
+        return max(self.expires - monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.expires is not None and monotonic() >= self.expires
+
+    def check(self) -> None:
+        """Fail right away if the deadline is gone."""
+        if self.expired:
+            raise DeadlineExceeded(
+                "Deadline of {}s exceeded".format(self.timeout)
+            )
+
+    def enforce(self, task: Task) -> TimerHandle:
+        """Cancel ``task`` (setting ``exceeded``) when the deadline is gone,
+        returning the timer to be cancelled if it finishes in time.
+        """
+        return get_event_loop().call_later(self.remaining, self._exceed, task)
+
+    def _exceed(self, task: Task) -> None:
+        self.exceeded = True
+        task.cancel()
+
+    def __repr__(self):
+        return "<Deadline remaining: {}>".format(self.remaining)
+
+
+# for requests to routes without a deadline
+NO_DEADLINE = Deadline()
+
+
+def with_deadline(timeout: float):
+    """Decorate a handler so requests to it are given ``timeout`` seconds:
+    past that, whatever is being done (including the resolution of
+    components) is cancelled and the request gets a ``503``.
+    """
+
+    def decorator(handler):
+        handler.deadline = timeout
+        return handler
+
+    return decorator
+
+
+__all__ = ("Deadline", "with_deadline")
@@ -24,3 +24,15 @@ class InvalidComponent(SanicBoomException):
         **kwargs
     ):
         super().__init__(message, **kwargs)
+
+
+class ExecutorFull(SanicBoomException):
+    status_code = 503
+
+
+class ExecutorTimeout(SanicBoomException):
+    status_code = 503
+
+
+class DeadlineExceeded(SanicBoomException):
+    status_code = 503
@@ -0,0 +1,246 @@
+import os
+import threading
+import typing as t
+from asyncio import (
+    Semaphore,
+    TimeoutError,
+    get_event_loop,
+    wait_for,
+    wrap_future,
+)
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from sanic_boom.exceptions import ExecutorFull, ExecutorTimeout
+from sanic_boom.metrics import render_stats
+
+DEFAULT_EXECUTOR = "default"
+PROCESS_EXECUTOR = "processes"
+
+
+class Offload:
+    """How a handler is called in an executor: with at most ``limit`` calls
+    of the same handler at a time (the others wait), and rejected with a
+    ``503`` if it takes more than ``timeout`` seconds.
+    """
+
+    __slots__ = ("executor", "limit", "timeout", "_semaphore", "_loop")
+
+    def __init__(
+        self, executor: str, limit: int = None, timeout: float = None
+    ):
+        self.executor = executor
+        self.limit = limit
+        self.timeout = timeout
+        self._semaphore = None
+        self._loop = None
+
+    async def run(
+        self, pool: "ThreadPool", func: t.Callable, kwargs: t.Dict
+    ) -> t.Any:
+        if self.limit is None:
+            return await self._run(pool, func, kwargs)
+
+        loop = get_event_loop()
+        if self._loop is not loop:
+            self._semaphore = Semaphore(self.limit)
+            self._loop = loop
+        async with self._semaphore:
+            return await self._run(pool, func, kwargs)
+
+    async def _run(
+        self, pool: "ThreadPool", func: t.Callable, kwargs: t.Dict
+    ) -> t.Any:
+        if self.timeout is None:
+            return await pool.run(func, **kwargs)
+        try:
+            return await wait_for(pool.run(func, **kwargs), self.timeout)
+        except TimeoutError:
+            raise ExecutorTimeout(
+                "{} took more than {}s in executor {!r}".format(
+                    getattr(func, "__name__", func), self.timeout, pool.name
+                )
+            )
+
+
+def run_in_thread(
+    executor: str = DEFAULT_EXECUTOR, limit: int = None, timeout: float = None
+):
+    """Decorate a (synchronous) handler to be called in a thread of the named
+    executor (see :meth:`SanicBoom.add_executor`), so it doesn't block the
+    event loop. Components do the same with their ``executor`` attribute.
+    See :class:`Offload` for ``limit`` and ``timeout``.
+    """
+
+    def decorator(handler):
+        handler.offload = Offload(executor, limit, timeout)
+        return handler
+
+    return decorator
+
+
+def run_in_process(
+    executor: str = PROCESS_EXECUTOR, limit: int = None, timeout: float = None
+):
+    """Decorate a CPU bound handler to be called in another process (the
+    ``processes`` executor is a :class:`ProcessPool` configured by
+    ``BOOM_PROCESS_WORKERS`` and ``BOOM_PROCESS_QUEUE``). The handler must be
+    importable by its name (defined at the top of a module) and everything it
+    gets from the resolver must be picklable - so, no request.
+    See :class:`Offload` for ``limit`` and ``timeout``.
+    """
+
+    def decorator(handler):
+        handler.offload = Offload(executor, limit, timeout)
+        return handler
+
+    return decorator
+
+
+class ThreadPool:
+    """A named ``ThreadPoolExecutor`` that rejects calls (with a ``503``)
+    when ``max_queue`` calls are already waiting for a thread, and counts
+    what goes through it. Threads are only created when needed (and after
+    :meth:`shutdown`, they will be again).
+    """
+
+    def __init__(
+        self, name: str, max_workers: int = None, max_queue: int = None
+    ):
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0  # submitted, not finished yet
+        self.active = 0  # running in a thread
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def queued(self) -> int:
+        return max(self.pending - self.active, 0)
+
+    async def run(self, func: t.Callable, *args, **kwargs) -> t.Any:
+        with self._lock:
+            if (
+                self.max_queue is not None
+                and self.pending >= self.max_workers + self.max_queue
+            ):
+                self.rejected += 1
+                raise ExecutorFull(
+                    "Executor {!r} has too many calls waiting".format(
+                        self.name
+                    )
+                )
+            self.pending += 1
+
+        try:
+            if self._executor is None:
+                self.start()
+            future = self._executor.submit(
+                *self._submit(partial(func, *args, **kwargs))
+            )
+        except BaseException:
+            with self._lock:
+                self.pending -= 1
+            raise
+        # a call is pending until it is really done (or cancelled before
+        # running), even if the caller gave up on it already
+        future.add_done_callback(self._done)
+        return await wrap_future(future)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="sanic-boom-{}".format(self.name),
+            )
+
+    def _submit(self, func: t.Callable) -> tuple:
+        return self._call, func
+
+    def _call(self, func: t.Callable) -> t.Any:
+        with self._lock:
+            self.active += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def _warm() -> None:
+    pass
+
+
+class ProcessPool(ThreadPool):
+    """A named ``ProcessPoolExecutor``, with the same queue limit and
+    counters of :class:`ThreadPool`. Processes are started along with the
+    server (in each worker), and reused for every call.
+    """
+
+    @property
+    def active(self) -> int:
+        return min(self.pending, self.max_workers)
+
+    @active.setter
+    def active(self, value: int) -> None:
+        pass  # only known by the processes themselves
+
+    def start(self) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            # all processes are started with the first call
+            self._executor.submit(_warm)
+
+    def _submit(self, func: t.Callable) -> tuple:
+        return (func,)
+
+
+def render(pools: t.Iterable[ThreadPool]) -> str:
+    """Gauges and counters of the given pools in the Prometheus text
+    format.
+    """
+    return render_stats(
+        "sanic_boom_executor_",
+        (
+            ("active", "gauge", "Calls running, by executor"),
+            ("queued", "gauge", "Calls waiting to run, by executor"),
+            ("completed", "counter", "Calls finished, by executor"),
+            ("failed", "counter", "Calls that raised, by executor"),
+            (
+                "rejected",
+                "counter",
+                "Calls rejected for a full queue, by executor",
+            ),
+        ),
+        (({"executor": pool.name}, pool) for pool in pools),
+    )
+
+
+__all__ = (
+    "Offload",
+    "ProcessPool",
+    "ThreadPool",
+    "run_in_process",
+    "run_in_thread",
+)
@@ -0,0 +1,89 @@
+import typing as t
+from asyncio import gather
+
+from sanic.log import error_logger
+
+from sanic_boom.component import Component
+
+
+def _levels(components: t.List[Component]) -> t.List[t.List[Component]]:
+    """Group ``components`` so each one comes after the ones it depends on
+    (the ones in the same group don't depend on each other).
+    """
+    deps = {
+        component: {
+            other
+            for other in components
+            if other is not component
+            and isinstance(other, tuple(component.depends_on))
+        }
+        for component in components
+    }
+    levels = []
+    done = set()
+
+    while len(done) < len(components):
+        level = [c for c in components if c not in done and deps[c] <= done]
+        if not level:
+            raise ValueError(
+                "Circular dependency between components: {}".format(
+                    ", ".join(
+                        type(c).__name__ for c in components if c not in done
+                    )
+                )
+            )
+        levels.append(level)
+        done.update(level)
+
+    return levels
+
+
+async def _start(component: Component) -> None:
+    if hasattr(component, "__aenter__"):
+        await component.__aenter__()
+    else:
+        await component.startup()
+
+
+async def _stop(component: Component) -> None:
+    try:
+        if hasattr(component, "__aexit__"):
+            await component.__aexit__(None, None, None)
+        else:
+            await component.shutdown()
+    except Exception:
+        error_logger.exception(
+            "Exception occurred while shutting down {!r}".format(component)
+        )
+
+
+async def startup(components: t.List[Component]) -> t.List[Component]:
+    """Start ``components`` concurrently, except for the ones that depend on
+    others, started after them. Returns the components started, in order; if
+    any one of them fails, the ones already started are shut down.
+    """
+    started = []
+
+    for level in _levels(components):
+        results = await gather(
+            *[_start(c) for c in level], return_exceptions=True
+        )
+        error = None
+        for component, result in zip(level, results):
+            if isinstance(result, BaseException):
+                error = error or result
+            else:
+                started.append(component)
+        if error is not None:
+            await shutdown(started)
+            raise error
+
+    return started
+
+
+async def shutdown(components: t.List[Component]) -> None:
+    """Shutdown ``components`` (as returned by :func:`startup`), the ones
+    that others depend on last.
+    """
+    for level in reversed(_levels(components)):
+        await gather(*[_stop(c) for c in level])
@@ -0,0 +1,260 @@
+import json
+import os
+import typing as t
+from array import array
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+STATUS_CLASSES = ("none", "1xx", "2xx", "3xx", "4xx", "5xx")
+_FILE_PREFIX = "sanic-boom-metrics-"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_stats(
+    prefix: str,
+    stats: t.Iterable[t.Tuple[str, str, str]],
+    sources: t.Iterable[t.Tuple[t.Dict[str, str], t.Any]],
+) -> str:
+    """Gauges and counters in the Prometheus text format: for each
+    ``(attribute, kind, help_text)`` in ``stats``, the value of the attribute
+    of every ``(labels, source)`` in ``sources``.
+    """
+    sources = tuple(sources)
+    lines = []
+    for attribute, kind, help_text in stats:
+        name = prefix + attribute
+        if kind == "counter":
+            name += "_total"
+        lines.append("# HELP {} {}.".format(name, help_text))
+        lines.append("# TYPE {} {}".format(name, kind))
+        for labels, source in sources:
+            if labels:
+                labels = "{{{}}}".format(
+                    ",".join(
+                        '{}="{}"'.format(k, _escape(v))
+                        for k, v in labels.items()
+                    )
+                )
+            lines.append(
+                "{}{} {}".format(
+                    name, labels or "", getattr(source, attribute)
+                )
+            )
+    return "\n".join(lines) + "\n"
+
+
+class RouteMetrics:
+    """Counters of a single route template and method, in fixed arrays
+    allocated only once: requests per status class and the latency
+    histogram (the last bucket being ``+Inf``), besides the requests
+    cancelled because the client disconnected.
+    """
+
+    __slots__ = ("statuses", "buckets", "sum", "disconnected")
+
+    def __init__(self, size: int):
+        self.statuses = array("Q", bytes(8 * len(STATUS_CLASSES)))
+        self.buckets = array("Q", bytes(8 * (size + 1)))
+        self.sum = 0.0
+        self.disconnected = 0
+
+    @property
+    def count(self) -> int:
+        return sum(self.statuses)
+
+
+class Metrics:
+    """Per route (template) and method request metrics. If ``directory`` is
+    given, :meth:`dump` writes the metrics of this process there so
+    :meth:`collect` (from any worker) can aggregate all of them.
+    """
+
+    def __init__(
+        self,
+        buckets: t.Sequence[float] = DEFAULT_BUCKETS,
+        directory: str = None,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.directory = directory
+        self.routes = {}
+
+    def observe(
+        self,
+        uri_template: t.Optional[str],
+        method: str,
+        status: t.Optional[int],
+        duration: float,
+        disconnected: bool = False,
+    ) -> None:
+        key = (uri_template or "", method)
+        metrics = self.routes.get(key)
+        if metrics is None:
+            metrics = self.routes[key] = RouteMetrics(len(self.buckets))
+
+        if status is None or not 100 <= status < 600:
+            metrics.statuses[0] += 1
+        else:
+            metrics.statuses[status // 100] += 1
+        metrics.buckets[bisect_left(self.buckets, duration)] += 1
+        metrics.sum += duration
+        if disconnected:
+            metrics.disconnected += 1
+
+    def snapshot(self) -> t.Dict[str, t.Any]:
+        return {
+            "buckets": list(self.buckets),
+            "routes": [
+                [
+                    uri_template,
+                    method,
+                    list(m.statuses),
+                    list(m.buckets),
+                    m.sum,
+                    m.disconnected,
+                ]
+                for (uri_template, method), m in self.routes.items()
+            ],
+        }
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(
+            self.directory, "{}{}.json".format(_FILE_PREFIX, pid)
+        )
+
+    def dump(self) -> None:
+        if self.directory is None:
+            return
+        path = self._path(os.getpid())
+        tmp = "{}.tmp".format(path)
+        with open(tmp, "w") as fp:
+            json.dump(self.snapshot(), fp)
+        os.replace(tmp, path)  # readers never see a partial file
+
+    def collect(self) -> t.Dict[t.Tuple[str, str], RouteMetrics]:
+        """Merge the live metrics of this process with the ones dumped by
+        every other process (if ``directory`` is set).
+        """
+        snapshots = [self.snapshot()]
+
+        if self.directory is not None:
+            own = self._path(os.getpid())
+            for name in sorted(os.listdir(self.directory)):
+                path = os.path.join(self.directory, name)
+                if not name.startswith(_FILE_PREFIX) or path == own:
+                    continue
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(path) as fp:
+                        snapshots.append(json.load(fp))
+                except (OSError, ValueError):
+                    continue
+
+        merged = {}
+        for snapshot in snapshots:
+            if tuple(snapshot["buckets"]) != self.buckets:
+                continue
+            for route in snapshot["routes"]:
+                uri_template, method, statuses, buckets, sum_, lost = route
+                key = (uri_template, method)
+                metrics = merged.get(key)
+                if metrics is None:
+                    metrics = merged[key] = RouteMetrics(len(self.buckets))
+                for i, value in enumerate(statuses):
+                    metrics.statuses[i] += value
+                for i, value in enumerate(buckets):
+                    metrics.buckets[i] += value
+                metrics.sum += sum_
+                metrics.disconnected += lost
+        return merged
+
+    def render(self) -> str:
+        """All (collected) metrics in the Prometheus text format."""
+        lines = [
+            "# HELP sanic_boom_requests_total Requests handled, by route "
+            "template, method and status class.",
+            "# TYPE sanic_boom_requests_total counter",
+        ]
+        collected = sorted(self.collect().items())
+
+        for (uri_template, method), metrics in collected:
+            labels = 'route="{}",method="{}"'.format(
+                _escape(uri_template), _escape(method)
+            )
+            for status, value in zip(STATUS_CLASSES, metrics.statuses):
+                if value:
+                    lines.append(
+                        'sanic_boom_requests_total{{{},status="{}"}} '
+                        "{}".format(labels, status, value)
+                    )
+
+        lines.extend(
+            [
+                "# HELP sanic_boom_request_duration_seconds Time spent "
+                "handling requests, by route template and method.",
+                "# TYPE sanic_boom_request_duration_seconds histogram",
+            ]
+        )
+
+        for (uri_template, method), metrics in collected:
+            labels = 'route="{}",method="{}"'.format(
+                _escape(uri_template), _escape(method)
+            )
+            cumulative = 0
+            bounds = [repr(b) for b in self.buckets] + ["+Inf"]
+            for bound, value in zip(bounds, metrics.buckets):
+                cumulative += value
+                lines.append(
+                    'sanic_boom_request_duration_seconds_bucket{{{},le="{}"}}'
+                    " {}".format(labels, bound, cumulative)
+                )
+            lines.append(
+                "sanic_boom_request_duration_seconds_sum{{{}}} {!r}".format(
+                    labels, metrics.sum
+                )
+            )
+            lines.append(
+                "sanic_boom_request_duration_seconds_count{{{}}} {}".format(
+                    labels, cumulative
+                )
+            )
+
+        lines.extend(
+            [
+                "# HELP sanic_boom_requests_disconnected_total Requests "
+                "cancelled because the client disconnected, by route "
+                "template and method.",
+                "# TYPE sanic_boom_requests_disconnected_total counter",
+            ]
+        )
+
+        for (uri_template, method), metrics in collected:
+            if metrics.disconnected:
+                lines.append(
+                    "sanic_boom_requests_disconnected_total{{"
+                    'route="{}",method="{}"}} {}'.format(
+                        _escape(uri_template),
+                        _escape(method),
+                        metrics.disconnected,
+                    )
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+__all__ = ("Metrics",)
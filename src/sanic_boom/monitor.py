@@ -0,0 +1,134 @@
+import sys
+import threading
+import traceback
+import typing as t
+from asyncio import sleep
+from collections import deque
+from time import perf_counter
+
+from sanic.log import logger
+
+from sanic_boom.component import Component
+
+
+class LoopMonitor:
+    """Measures the lag of the event loop (how late a ``sleep`` of
+    ``interval`` seconds wakes up) and watches it from another thread: if the
+    loop is stuck in a single callback for ``threshold`` seconds or more, the
+    route and component being executed at that moment are reported (logged
+    and kept in ``reports``), along with the stack.
+    """
+
+    def __init__(
+        self, threshold: float = 0.1, interval: float = 0.05, size: int = 100
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self.reports = deque(maxlen=size)
+        self.running = False
+        self._beat = None
+        self._reported = None
+        self._task = None
+        self._thread = None
+        self._thread_id = None
+        self._stop = threading.Event()
+
+    def start(self, loop) -> None:
+        """Start monitoring ``loop``, which must be running on the current
+        thread.
+        """
+        if self.running:
+            return
+        self.running = True
+        self._beat = perf_counter()
+        self._thread_id = threading.get_ident()
+        self._task = loop.create_task(self._heartbeat())
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="sanic-boom-loop-monitor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        self._task.cancel()
+        self._task = None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = perf_counter()
+            await sleep(self.interval)
+            self._beat = now = perf_counter()
+            self.lag = max(now - start - self.interval, 0.0)
+            if self.lag > self.max_lag:
+                self.max_lag = self.lag
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval / 2):
+            beat = self._beat
+            blocked = perf_counter() - beat - self.interval
+            if blocked >= self.threshold and self._reported != beat:
+                self._reported = beat
+                self.report(blocked)
+
+    def report(self, blocked: float) -> None:
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return
+
+        report = self.inspect(frame)
+        report["blocked"] = blocked
+        self.reports.append(report)
+        logger.warning(
+            "Event loop blocked for {:.3f}s (route: {}, stage: {}, "
+            "component: {})\n{}".format(
+                blocked,
+                report["route"],
+                report["stage"],
+                report["component"],
+                "".join(report["stack"]),
+            )
+        )
+
+    def inspect(self, frame) -> t.Dict[str, t.Any]:
+        """What is being executed on ``frame`` (and the ones that called
+        it), as far as the application is concerned.
+        """
+        route = stage = component = None
+        stack = traceback.format_stack(frame, limit=8)
+
+        while frame is not None:
+            code = frame.f_code
+            if component is None and code.co_name == "_resolve_param":
+                value = frame.f_locals.get("component")
+                if isinstance(value, Component):
+                    component = type(value).__name__
+            elif code.co_name == "handle_request":
+                request = frame.f_locals.get("request")
+                if request is not None:
+                    route = "{} {}".format(
+                        request.method,
+                        getattr(request, "uri_template", None) or request.path,
+                    )
+                    trace = getattr(request, "trace", None)
+                    if trace is not None and trace.stage is not None:
+                        stage = trace.stage.name
+                    break
+            frame = frame.f_back
+
+        return {
+            "route": route,
+            "stage": stage,
+            "component": component,
+            "stack": stack,
+        }
+
+
+__all__ = ("LoopMonitor",)
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import typing as t
+
+IDLE = "<idle>"
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return "{} ({}:{})".format(
+        code.co_name, os.path.basename(code.co_filename), code.co_firstlineno
+    )
+
+
+class SamplingProfiler:
+    """Samples the stack of the event loop thread every ``interval`` seconds
+    (from another thread), attributing each sample to the route being handled
+    at that moment, if any. The output is in the "collapsed stack" format,
+    used by flamegraph tools.
+
+    It costs nothing more than an attribute check per request while not
+    running.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = {}
+        self.running = False
+        self._frames = {}
+        self._thread = None
+        self._thread_id = None
+        self._stop = threading.Event()
+
+    def start(self, thread_id: int = None) -> None:
+        """Start sampling the given thread (the current one by default, which
+        should be the one running the event loop).
+        """
+        if self.running:
+            return
+        self._thread_id = thread_id or threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sanic-boom-profiler", daemon=True
+        )
+        self.running = True
+        self._thread.start()
+
+    def stop(self) -> None:
+        if not self.running:
+            return
+        self.running = False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._frames.clear()
+
+    def reset(self) -> None:
+        self.samples = {}
+
+    def enter(self, frame, label: str) -> None:
+        self._frames[frame] = label
+
+    def leave(self, frame) -> None:
+        self._frames.pop(frame, None)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self._thread_id)
+        if frame is None:
+            return
+
+        label = None
+        stack = []
+
+        while frame is not None:
+            if label is None:
+                label = self._frames.get(frame)
+            stack.append(_frame_name(frame))
+            frame = frame.f_back
+
+        stack.append(label or IDLE)
+        key = ";".join(reversed(stack))
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    def collapsed(self, label: str = None) -> str:
+        """The samples taken so far, in the collapsed stack format, optionally
+        only the ones of a route (``"GET /search"``, for example).
+        """
+        samples = [
+            "{} {}".format(stack, count)
+            for stack, count in sorted(self.samples.items())
+            if label is None or stack.split(";", 1)[0] == label
+        ]
+        return "\n".join(samples) + "\n" if samples else ""
+
+    def routes(self) -> t.Dict[str, int]:
+        ret = {}
+        for stack, count in list(self.samples.items()):
+            label = stack.split(";", 1)[0]
+            ret[label] = ret.get(label, 0) + count
+        return ret
+
+
+__all__ = ("SamplingProfiler",)
@@ -0,0 +1,42 @@
+from sanic.server import HttpProtocol
+from sanic.websocket import WebSocketProtocol
+
+
+class DisconnectMixin:
+    """Tells the request being handled (by setting ``request.disconnected``)
+    when the connection is lost because the client is gone, and not because
+    the server closed it (after an error, like the response timeout, or when
+    shutting down).
+    """
+
+    _closed_by_server = False
+
+    def write_error(self, exception):
+        self._closed_by_server = True  # the connection is always closed
+        super().write_error(exception)
+
+    def close(self):
+        self._closed_by_server = True
+        super().close()
+
+    def connection_lost(self, exc):
+        task = self._request_handler_task
+        if (
+            not self._closed_by_server
+            and self.request is not None
+            and task is not None
+            and not task.done()
+        ):
+            self.request.disconnected = True
+        super().connection_lost(exc)
+
+
+class BoomHttpProtocol(DisconnectMixin, HttpProtocol):
+    pass
+
+
+class BoomWebSocketProtocol(DisconnectMixin, WebSocketProtocol):
+    pass
+
+
+__all__ = ("BoomHttpProtocol", "BoomWebSocketProtocol", "DisconnectMixin")
@@ -0,0 +1,156 @@
+import multiprocessing
+import typing as t
+import zlib
+from array import array
+from math import ceil
+from time import monotonic
+
+from sanic.response import HTTPResponse
+
+
+def client_address(request) -> t.Optional[str]:
+    # without proxy headers, it is the peer of the connection
+    return request.remote_addr or request.ip
+
+
+class _LocalBuckets:
+    """Token buckets of a single worker: a dict from each key to its slot in
+    a flat array of ``(tokens, updated)`` pairs. Buckets full again (unused
+    for long enough) are dropped every ``compact_interval`` seconds, as they
+    are the same as no bucket at all.
+    """
+
+    def __init__(self, compact_interval: float):
+        self.compact_interval = compact_interval
+        self.slots = {}
+        self.values = array("d")
+        self._compacted = 0.0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def take(self, key: t.Hashable, rate: float, burst: float, now: float):
+        if now - self._compacted >= self.compact_interval:
+            self.compact(rate, burst, now)
+
+        values = self.values
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(values)
+            values.extend((burst, now))
+        return _take(values, slot, rate, burst, now)
+
+    def compact(self, rate: float, burst: float, now: float) -> None:
+        values = self.values
+        slots = {}
+        live = array("d")
+        for key, slot in self.slots.items():
+            tokens, updated = values[slot], values[slot + 1]
+            if tokens + (now - updated) * rate < burst:
+                slots[key] = len(live)
+                live.extend((tokens, updated))
+        self.slots = slots
+        self.values = live
+        self._compacted = now
+
+
+class _SharedBuckets:
+    """A fixed number of token buckets in shared memory, created before the
+    workers are forked, so all of them see the same buckets. Keys are hashed
+    into the slots: two keys may (rarely, with enough ``slots``) share a
+    bucket.
+    """
+
+    def __init__(self, slots: int):
+        self.size = slots
+        # (tokens, updated) pairs; updated == 0 means it was never used
+        self.values = multiprocessing.RawArray("d", slots * 2)
+        self.lock = multiprocessing.Lock()
+
+    def __len__(self) -> int:
+        return sum(1 for i in range(1, self.size * 2, 2) if self.values[i])
+
+    def take(self, key: t.Hashable, rate: float, burst: float, now: float):
+        slot = zlib.crc32(str(key).encode()) % self.size * 2
+        values = self.values
+        with self.lock:
+            if not values[slot + 1]:
+                values[slot] = burst
+                values[slot + 1] = now
+            return _take(values, slot, rate, burst, now)
+
+
+def _take(values, slot: int, rate: float, burst: float, now: float) -> float:
+    tokens = values[slot] + (now - values[slot + 1]) * rate
+    if tokens > burst:
+        tokens = burst
+    values[slot + 1] = now
+    if tokens >= 1:
+        values[slot] = tokens - 1
+        return 0.0
+    values[slot] = tokens
+    return (1 - tokens) / rate
+
+
+class RateLimit:
+    """Rate limiting for routes, with a token bucket per key: ``rate``
+    requests per second, in bursts of up to ``burst`` requests. Anything
+    else gets a ``429`` (with a ``Retry-After`` header) right after routing,
+    before any component required by the handler is resolved.
+
+    The key is the client address by default, or what ``key`` returns: its
+    parameters are resolved like the ones of a handler, so it may be keyed
+    by any component value (an API key, the current user id) - cheap ones,
+    preferably, as they are resolved for every request (and shared with the
+    handler). Requests with a ``None`` key are not limited.
+
+    Buckets live in the memory of each worker unless ``shared``, when a fixed
+    number of ``slots`` in shared memory is used by all of them (the instance
+    must be created before the server starts).
+
+    Instances decorate handlers; decorating many handlers with the same
+    instance limits them as a group.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = None,
+        key: t.Callable = None,
+        shared: bool = False,
+        slots: int = 65536,
+        compact_interval: float = 60.0,
+    ):
+        self.rate = rate
+        self.burst = max(rate, 1) if burst is None else burst
+        self.key = client_address if key is None else key
+        self.rejected = 0
+        if shared:
+            self.buckets = _SharedBuckets(slots)
+        else:
+            self.buckets = _LocalBuckets(compact_interval)
+
+    def __call__(self, handler):
+        handler.rate_limit = self
+        return handler
+
+    def take(self, key: t.Hashable, now: float = None) -> float:
+        """Take a token from the bucket of ``key``, returning ``0`` if there
+        was one or, otherwise, how many seconds until there will be.
+        """
+        if now is None:
+            now = monotonic()
+        wait = self.buckets.take(key, self.rate, self.burst, now)
+        if wait:
+            self.rejected += 1
+        return wait
+
+    def rejected_response(self, wait: float) -> HTTPResponse:
+        return HTTPResponse(
+            "Too Many Requests",
+            status=429,
+            headers={"Retry-After": str(ceil(wait))},
+        )
+
+
+__all__ = ("RateLimit",)
@@ -1,10 +1,15 @@
 from sanic.request import Request
 from sanic_ipware import get_client_ip
 
+from sanic_boom.deadline import NO_DEADLINE
 from sanic_boom.utils import REQUEST_CACHE_KEY
 
 
 class BoomRequest(Request):
+    trace = None  # a sanic_boom.tracing.Trace, if tracing is enabled
+    deadline = NO_DEADLINE  # replaced for routes with a deadline
+    disconnected = False  # set by the protocol, when the client is gone
+
     @property
     def remote_addr(self):
         if not hasattr(self, "_remote_addr"):
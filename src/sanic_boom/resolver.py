@@ -5,15 +5,25 @@ from functools import lru_cache
 from sanic.log import logger
 from sanic.request import Request
 
-from sanic_boom.component import Component
+from sanic_boom.component import Component, ComponentCache
+from sanic_boom.deadline import NO_DEADLINE, Deadline
 from sanic_boom.exceptions import InvalidComponent, NoApplicationFound
 from sanic_boom.request import BoomRequest
+from sanic_boom.utils import param_parser
+
+_REQUEST = 1
+_PARAM = 2
+_VIEW_REQUEST = 3
+_SKIP = 4
+_COMPONENT = 5
+_DEADLINE = 6
 
 
 class Resolver:
     def __init__(self, app=None):
         self.app = app
         self.components = []
+        self._plans = {}
 
     def add_component(self, component: Component):
         if self.app is None:
@@ -21,7 +31,21 @@ class Resolver:
         if not issubclass(component, Component):
             raise InvalidComponent()
 
-        self.components.append(component(self.app))
+        instance = component(self.app)
+        if inspect.isasyncgenfunction(
+            instance.get
+        ) and instance.get_cache_lifecycle() not in (
+            ComponentCache.NO_CACHE,
+            ComponentCache.REQUEST,
+        ):
+            # torn down after the first response, it would be cached closed
+            raise InvalidComponent(
+                "{}.get is an async generator, so it can't be cached beyond "
+                "the request".format(component.__name__)
+            )
+        self.components.append(instance)
+        # previously compiled plans may now resolve to the new component
+        self._plans.clear()
 
     @lru_cache(maxsize=768)
     def find_component(self, *, param: inspect.Parameter) -> Component:
@@ -31,6 +55,91 @@ class Resolver:
                 return component
         return None
 
+    def compile(self, func: t.Callable) -> t.Tuple[tuple, ...]:
+        """Inspect the signature of ``func`` only once, returning a "plan" of
+        how each one of its parameters should be resolved.
+        """
+        plan = self._plans.get(func)
+        if plan is not None:
+            return plan
+
+        if not (
+            inspect.isfunction(func)
+            or inspect.ismethod(func)  # like a synchronous Component.get
+            or inspect.iscoroutinefunction(func)
+        ):
+            raise TypeError('The provided parameter "func" is not a function')
+
+        plan = []
+
+        for param in inspect.signature(func).parameters.values():
+            component = None
+
+            if (
+                inspect.isclass(param.annotation)
+                and issubclass(param.annotation, Request)
+            ) or param.name in ("request", "req"):
+                action = _REQUEST
+            elif inspect.isclass(param.annotation) and issubclass(
+                param.annotation, Deadline
+            ):
+                action = _DEADLINE
+            elif isinstance(
+                param.annotation, inspect.Parameter
+            ) or param.name in ("param", "parameter"):
+                action = _PARAM
+            elif param.kind == param.VAR_POSITIONAL:  # equals *args, *a
+                # this is only valid for HTTPMethodView
+                action = (
+                    _VIEW_REQUEST if hasattr(func, "view_class") else _SKIP
+                )
+            elif param.kind == param.VAR_KEYWORD:  # equals **kw, **kwargs
+                action = _SKIP
+            else:
+                action = _COMPONENT
+                component = self.find_component(param=param)
+
+            plan.append((param, action, component))
+
+        plan = tuple(plan)
+        self._plans[func] = plan
+        return plan
+
+    def find_plain(
+        self,
+        func: t.Callable,
+        names: t.Iterable[str],
+        converted: t.Iterable[str] = (),
+    ) -> t.Optional[t.Tuple[str, ...]]:
+        """Check if ``func`` requires nothing more than the request and the
+        given route parameters (which must need no parsing, being already
+        ``converted`` by the router or not annotated at all) and takes all of
+        the route parameters, as they are passed as they are. If so, returns
+        the name(s) of the request parameter, otherwise ``None``.
+        """
+        request_names = []
+        declared = set()
+
+        for param, action, _ in self.compile(func):
+            if action == _REQUEST:
+                request_names.append(param.name)
+            elif action != _COMPONENT or param.name not in names:
+                return None
+            elif param.name not in converted and (
+                param.annotation is not param.empty
+                or self.app.param_parser is not param_parser
+            ):
+                return None
+            else:
+                declared.add(param.name)
+
+        if declared != set(names):
+            return None
+        return tuple(request_names)
+
+    def invalidate(self, func: t.Callable) -> None:
+        self._plans.pop(func, None)
+
     async def resolve(
         self,
         *,
@@ -39,59 +148,43 @@ class Resolver:
         prefetched: t.Dict[str, t.Any] = None,
         source_param: inspect.Parameter = None
     ) -> t.Dict[str, t.Any]:
-        if not inspect.isfunction(func) and not inspect.iscoroutinefunction(
-            func
-        ):
-            raise TypeError('The provided parameter "func" is not a function')
         kwargs = {}
-        params = inspect.signature(func).parameters
 
-        for param in params.values():
+        for param, action, component in self.compile(func):
 
             if prefetched is not None and param.name in prefetched:
-                kwargs.update(
-                    {
-                        param.name: self.app.param_parser(
-                            prefetched.get(param.name), param
-                        )
-                    }
-                )
+                value = prefetched.get(param.name)
+                # typed route parameters are already converted by the router
+                if isinstance(value, str):
+                    value = self.app.param_parser(value, param)
+                kwargs.update({param.name: value})
                 continue
 
-            if (
-                inspect.isclass(param.annotation)
-                and issubclass(param.annotation, Request)
-            ) or param.name in ("request", "req"):
+            if action == _REQUEST:
                 kwargs.update({param.name: request})
                 continue
 
-            if isinstance(
-                param.annotation, inspect.Parameter
-            ) or param.name in ("param", "parameter"):
+            if action == _DEADLINE:
+                kwargs.update(
+                    {param.name: getattr(request, "deadline", NO_DEADLINE)}
+                )
+                continue
+
+            if action == _PARAM:
                 kwargs.update({param.name: source_param or param})
                 continue
 
-            if param.kind == param.VAR_POSITIONAL:  # equals *args, *a
-                # this is only valid for HTTPMethodView
-                if hasattr(func, "view_class"):
-                    # most likely request is the only thing missing here
-                    kwargs.update({"request": request})
-                else:
-                    logger.debug(
-                        "Parameter '{}' skipped from resolver".format(
-                            param.name
-                        )
-                    )
+            if action == _VIEW_REQUEST:
+                # most likely request is the only thing missing here
+                kwargs.update({"request": request})
                 continue
 
-            elif param.kind == param.VAR_KEYWORD:  # equals **kw, **kwargs
+            elif action == _SKIP:
                 logger.debug(
                     "Parameter '{}' skipped from resolver".format(param.name)
                 )
                 continue
 
-            component = self.find_component(param=param)
-
             if component is None:
                 raise ValueError(
                     'The requested parameter "{}" could not be resolved to a '
@@ -0,0 +1,198 @@
+import hashlib
+import typing as t
+from time import monotonic
+
+from multidict import CIMultiDict
+from sanic.response import HTTPResponse
+
+from sanic_boom.router import normalize_host
+
+CACHEABLE_METHODS = frozenset(("GET", "HEAD"))
+
+
+class CachePolicy:
+    """How the responses of a route are cached: for ``ttl`` seconds, keyed by
+    the method, host (for routes with a ``host``), route template and
+    parameters, the values of ``query_args`` and of the ``vary`` request
+    headers.
+    """
+
+    __slots__ = ("ttl", "query_args", "vary")
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        query_args: t.Iterable[str] = (),
+        vary: t.Iterable[str] = (),
+    ):
+        self.ttl = ttl
+        self.query_args = tuple(query_args)
+        self.vary = tuple(vary)
+
+    def key(self, request, route, params: t.Dict[str, t.Any]) -> tuple:
+        args = request.args
+        headers = request.headers
+        return (
+            request.method,
+            # routes with a host (or many, or a wildcard) may be served for
+            # different hosts, never to be mixed
+            None if route.host is None else normalize_host(request.host),
+            route.uri,
+            tuple(sorted(params.items())) if params else (),
+            tuple(tuple(args.getlist(a, ())) for a in self.query_args),
+            tuple(headers.get(h) for h in self.vary),
+        )
+
+
+class CachedResponse:
+    __slots__ = (
+        "body",
+        "status",
+        "headers",
+        "content_type",
+        "etag",
+        "expires",
+    )
+
+    def __init__(
+        self, response: HTTPResponse, etag: str = None, expires: float = 0
+    ):
+        self.body = response.body
+        self.status = response.status
+        self.headers = CIMultiDict(response.headers)  # repeated ones too
+        self.content_type = response.content_type
+        self.etag = etag
+        self.expires = expires
+
+    def response(self) -> HTTPResponse:
+        return HTTPResponse(
+            body_bytes=self.body,
+            status=self.status,
+            headers=CIMultiDict(self.headers),
+            content_type=self.content_type,
+        )
+
+
+def cache_response(
+    ttl: float = 60.0,
+    query_args: t.Iterable[str] = (),
+    vary: t.Iterable[str] = (),
+):
+    """Decorate a handler to have its (``200``, ``GET`` or ``HEAD``)
+    responses cached in memory for ``ttl`` seconds. While cached, requests are
+    answered without calling the resolver nor the handler (layered request
+    middlewares still run), and with ``304 Not Modified`` if they match the
+    ``ETag``. Only the query arguments named in ``query_args`` and the request
+    headers named in ``vary`` make a difference in the response.
+    """
+    policy = CachePolicy(ttl=ttl, query_args=query_args, vary=vary)
+
+    def decorator(handler):
+        handler.cache_policy = policy
+        return handler
+
+    return decorator
+
+
+def coalesce_requests(
+    query_args: t.Iterable[str] = (), vary: t.Iterable[str] = ()
+):
+    """Decorate a handler so identical ``GET`` and ``HEAD`` requests (same
+    route template and parameters, values of ``query_args`` and of the
+    ``vary`` request headers) arriving while one of them is being handled
+    share its response, instead of each one going through the resolver and
+    the handler.
+    """
+    policy = CachePolicy(ttl=0, query_args=query_args, vary=vary)
+
+    def decorator(handler):
+        handler.coalesce_policy = policy
+        return handler
+
+    return decorator
+
+
+def shareable(response) -> bool:
+    """If ``response`` may be sent to other clients as well: it must be an
+    ``HTTPResponse`` (not streamed) and set no cookies.
+    """
+    return (
+        isinstance(response, HTTPResponse)
+        and "Set-Cookie" not in response.headers
+        and not getattr(response, "_cookies", None)
+    )
+
+
+def not_modified(request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """A bounded (the oldest entries are dropped first) in memory store of
+    responses, for the routes with a :class:`CachePolicy`.
+    """
+
+    def __init__(self, size: int = 1024):
+        self.size = size
+        self.entries = {}
+
+    def get(self, request, key: tuple) -> t.Optional[HTTPResponse]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= monotonic():
+            self.entries.pop(key, None)
+            return None
+        if not_modified(request, entry.etag):
+            return HTTPResponse(status=304, headers={"ETag": entry.etag})
+        return entry.response()
+
+    def put(self, request, key: tuple, policy: CachePolicy, response) -> t.Any:
+        """Store ``response`` (if it can be cached), returning the response
+        to be sent.
+        """
+        if not shareable(response) or response.status != 200:
+            return response
+
+        etag = response.headers.get("ETag")
+        if etag is None:
+            etag = '"{}"'.format(
+                hashlib.blake2b(response.body, digest_size=16).hexdigest()
+            )
+            response.headers["ETag"] = etag
+        if policy.vary and "Vary" not in response.headers:
+            response.headers["Vary"] = ", ".join(policy.vary)
+
+        if len(self.entries) >= self.size and key not in self.entries:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = CachedResponse(
+            response, etag, monotonic() + policy.ttl
+        )
+
+        if not_modified(request, etag):
+            return HTTPResponse(status=304, headers={"ETag": etag})
+        return response
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+__all__ = (
+    "CachePolicy",
+    "CachedResponse",
+    "ResponseCache",
+    "cache_response",
+    "coalesce_requests",
+)
@@ -1,7 +1,8 @@
 import re
+import typing as t
+import uuid
 import warnings
 from collections.abc import Iterable
-from functools import lru_cache
 
 from sanic.exceptions import MethodNotSupported, NotFound
 from sanic.router import ROUTER_CACHE_SIZE, RouteExists
@@ -10,11 +11,298 @@ from xrtr import RadixTree
 from sanic_boom.references import DOC_LINKS as dl
 from sanic_boom.wrappers import Middleware, MiddlewareType, Route
 
+_TYPED_PARAM = re.compile(r"([:\*])([^/<]+)<(.+?)>(?=/|$)")
+_CATCH_ALL = re.compile(r"([^:\*]*?)/\*([^/]+)")
+
+ROUTE_CONVERTERS = {
+    "int": (r"-?\d+", int),
+    "float": (r"-?\d+(?:\.\d+)?", float),
+    "uuid": (
+        r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-"
+        r"[0-9a-fA-F]{12}",
+        uuid.UUID,
+    ),
+    "slug": (r"[a-z0-9]+(?:-[a-z0-9]+)*", str),
+}
+_MISSING = object()
+_NOT_ALLOWED = object()
+
+
+def _normalize(url):
+    # url "normalization", there is no strict slashes for mental sakeness
+    url = url.strip()
+
+    if url.count("/") > 1 and url[-1] == "/":
+        url = url[:-1]  # yes, yes yes and yes! (:
+    return url
+
+
+def _prefix_match(path, url):
+    if path == "/":
+        return True
+
+    pattern = path.strip("/").split("/")
+    parts = url.strip("/").split("/")
+
+    if len(pattern) > len(parts):
+        return False
+    for p, u in zip(pattern, parts):
+        if p[:1] == "*":
+            break
+        if p[:1] != ":" and p != u:
+            return False
+    return True
+
+
+def _store(cache, key, value):
+    if len(cache) >= ROUTER_CACHE_SIZE:
+        # dicts are ordered, so this drops the oldest entry
+        del cache[next(iter(cache))]
+    cache[key] = value
+    return value
+
+
+def normalize_host(host: str) -> str:
+    """The host of a request as the router sees it: lower case and without
+    the port.
+    """
+    host = host.lower()
+    if not host.endswith("]"):  # ipv6 without port
+        host = host.rsplit(":", 1)[0]
+    return host
+
+
+def _convert(route: Route, params: t.Dict[str, t.Any]) -> bool:
+    """Validate and convert (in place) the typed parameters of ``route``,
+    returning ``False`` on any mismatch.
+    """
+    for name, pattern, cast in route.converters:
+        try:
+            if pattern.fullmatch(params[name]) is None:
+                return False
+            params[name] = cast(params[name])
+        except ValueError:
+            return False
+    return True
+
+
+class RouteTable:
+    """All the routing state of a :class:`BoomRouter`: the tree (one per host)
+    and their caches. A table being served is only ever appended to, and it
+    is replaced as a whole by :meth:`BoomRouter.swap`.
+    """
 
-class BoomRouter:
     def __init__(self):
-        self._tree = RadixTree()
+        self.tree = RadixTree()
+        self.hosts = {}
+        self.wildcard_hosts = []
+        self.host_middlewares = []
+        self.middlewares = {}
+        self.catch_alls = {}
+        self.records = []
         self.routes_names = {}
+        self.cache = {}
+        self.allowed_cache = {}
+        self.host_cache = {}
+
+    def insert(self, path, methods, host, item):
+        if isinstance(item, Middleware):
+            if host is None:
+                # layered middlewares without a host are valid for every
+                # host, so they are inserted on each one of their trees
+                self.host_middlewares.append((path, item, methods))
+                trees = [self.tree] + list(self.hosts.values())
+            else:
+                trees = self.trees_for(host)
+                for key in self.host_keys(host):
+                    self.middlewares.setdefault(key, []).append(
+                        (path, item, methods)
+                    )
+            for tree in trees:
+                tree.insert(path, item, methods, no_conflict=True)
+        else:
+            match = _CATCH_ALL.fullmatch(path)
+            if match is not None:
+                self._insert_catch_all(
+                    match.group(1), match.group(2), methods, host, item
+                )
+            else:
+                for tree in self.trees_for(host):
+                    tree.insert(path=path, handler=item, methods=methods)
+            self.routes_names[item.name] = (item.uri, item)
+        self.records.append((path, methods, host, item))
+        self.cache.clear()
+        self.allowed_cache.clear()
+
+    def _insert_catch_all(self, prefix, name, methods, host, route):
+        # catch-all routes with a static prefix live outside the tree, so they
+        # don't conflict with anything else and have the lowest priority
+        for key in self.host_keys(host):
+            entries = self.catch_alls.setdefault(key, {})
+            entries = entries.setdefault(prefix, {})
+            for method in methods:
+                if method in entries:
+                    raise KeyError(
+                        "{} is already registered for {}".format(
+                            method, route.uri
+                        )
+                    )
+            entries.update(dict.fromkeys(methods, (route, name)))
+
+    def trees_for(self, host):
+        return [
+            self.tree if key is None else self.hosts[key]
+            for key in self.host_keys(host)
+        ]
+
+    def host_keys(self, host):
+        if host is None:
+            return [None]
+        if isinstance(host, str):
+            host = [host]
+
+        keys = []
+
+        for h in host:
+            h = h.strip().lower()
+            if h not in self.hosts:
+                tree = RadixTree()
+                for uri, middleware, methods in self.host_middlewares:
+                    tree.insert(uri, middleware, methods, no_conflict=True)
+                self.hosts[h] = tree
+                if h.startswith("*."):
+                    self.wildcard_hosts.append((h[1:], h))
+                    # the most specific wildcard should always win
+                    self.wildcard_hosts.sort(key=lambda w: -len(w[0]))
+                self.host_cache.clear()
+            keys.append(h)
+        return keys
+
+    def find_host(self, host):
+        ret = self.host_cache.get(host, _MISSING)
+        if ret is _MISSING:
+            ret = _store(self.host_cache, host, self._find_host(host))
+        return ret
+
+    def _find_host(self, host):
+        lowered = host.lower()
+        if lowered in self.hosts:
+            return lowered
+        host = normalize_host(lowered)
+        if host in self.hosts:
+            return host
+        for suffix, wildcard in self.wildcard_hosts:
+            if host.endswith(suffix):
+                return wildcard
+        return None
+
+    def get(self, url, method, host=None):
+        key = (url, method, host)
+        ret = self.cache.get(key)
+        if ret is None:
+            ret = _store(self.cache, key, self._get(url, method, host))
+        return ret
+
+    def allowed(self, url, host=None):
+        key = (url, host)
+        ret = self.allowed_cache.get(key)
+        if ret is None:
+            ret = _store(self.allowed_cache, key, self._allowed(url, host))
+        return ret
+
+    def _allowed(self, url, host=None):
+        url = _normalize(url)
+
+        for key in (None,) if host is None else (host, None):
+            tree = self.tree if key is None else self.hosts[key]
+            methods = set(tree.methods_for(url) or ())
+            if key in self.catch_alls:
+                entries, _ = self._find_catch_all(key, url)
+                methods.update(entries or ())
+            if methods:
+                return frozenset(methods)
+        return frozenset()
+
+    def _find_catch_all(self, key, url):
+        catch_alls = self.catch_alls[key]
+        prefix = url
+
+        while True:
+            # from the longest to the shortest prefix, segment by segment
+            entries = catch_alls.get(prefix)
+            if entries is not None:
+                return entries, url[len(prefix) :].lstrip("/")
+            if not prefix:
+                return None, None
+            prefix = prefix.rsplit("/", 1)[0]
+
+    def _middlewares_for(self, key, url, method):
+        candidates = list(self.host_middlewares)
+        if key is not None:
+            candidates.extend(self.middlewares.get(key, ()))
+        candidates.sort(key=lambda c: c[0].rstrip("/").count("/"))
+        return [
+            middleware
+            for path, middleware, methods in candidates
+            if method in methods and _prefix_match(path, url)
+        ]
+
+    def _get(self, url, method, host=None):
+        url = _normalize(url)
+
+        # static, then parameters (both from the tree) and then catch-alls;
+        # first for the requested host and then for the default tree
+        for key in (None,) if host is None else (host, None):
+            tree = self.tree if key is None else self.hosts[key]
+            route, middlewares, params = tree.get(url, method)
+            if (
+                route is not None
+                and route is not tree.sentinel
+                and not _convert(route, params)
+            ):
+                route = None  # typed parameters mismatch, falls through
+
+            if (
+                route is None or route is tree.sentinel
+            ) and key in self.catch_alls:
+                entries, rest = self._find_catch_all(key, url)
+                if entries is not None and method in entries:
+                    route, name = entries[method]
+                    params = {name: rest}
+                    middlewares = self._middlewares_for(key, url, method)
+                    if not _convert(route, params):
+                        route = None
+                elif entries is not None and route is None:
+                    route = _NOT_ALLOWED
+
+            if route is not None:
+                break
+
+        if route is tree.sentinel or route is _NOT_ALLOWED:
+            # returned instead of raised, so it gets cached as well
+            return MethodNotSupported(
+                "Method {} not allowed for URL {}".format(method, url),
+                method=method,
+                allowed_methods=sorted(self.allowed(url, host)),
+            )
+        elif route is None:
+            raise NotFound("Requested URL {} not found".format(url))
+
+        # ------------------------------------------------------------------- #
+        # code taken and adapted from the Sanic router
+        # ------------------------------------------------------------------- #
+        route_handler = route.handler
+
+        if hasattr(route_handler, "handlers"):  # noqa
+            # W-W-WHY ?! I don't even know what this is or why is it here
+            route_handler = route_handler.handlers[method]
+        return route, route_handler, middlewares, params
+
+
+class BoomRouter:
+    def __init__(self):
+        self.converters = dict(ROUTE_CONVERTERS)
+        self._table = RouteTable()
 
     def add(
         self,
@@ -39,6 +327,7 @@ class BoomRouter:
             version = re.escape(str(version).strip("/").lstrip("v"))
             uri = "/".join(["/v{}".format(version), uri.lstrip("/")])
         uri = re.sub(r"\/{2,}", "/", uri)
+        path, converters = self._compile_uri(uri)
 
         try:
             if not isinstance(methods, Iterable):
@@ -53,7 +342,7 @@ class BoomRouter:
 
             if is_middleware:
                 middleware = Middleware(handler=handler, attach_to=attach_to)
-                self._tree.insert(uri, middleware, methods, no_conflict=True)
+                self._table.insert(path, methods, host, middleware)
 
             else:
                 handler_name = None  # old habits die hard
@@ -67,7 +356,7 @@ class BoomRouter:
                 else:
                     handler_name = name or getattr(handler, "__name__", None)
 
-                if self.routes_names.get(handler_name) is not None:
+                if self._table.routes_names.get(handler_name) is not None:
                     msg = (
                         "The given route with handler_name='{}' is already "
                         "registered or clashes with "
@@ -80,13 +369,77 @@ class BoomRouter:
                     methods=methods,
                     uri=uri,
                     name=handler_name,
+                    host=host,
+                    converters=converters,
                 )
-                self._tree.insert(path=uri, handler=route, methods=methods)
-                self.routes_names[handler_name] = (uri, route)
+                self._table.insert(path, methods, host, route)
 
         except KeyError as ke:
             raise RouteExists from ke
 
+    @property
+    def routes_names(self):
+        return self._table.routes_names
+
+    @property
+    def routes(self) -> t.List[Route]:
+        return [r[3] for r in self._table.records if isinstance(r[3], Route)]
+
+    @property
+    def middlewares(self) -> t.List[Middleware]:
+        return [
+            r[3] for r in self._table.records if isinstance(r[3], Middleware)
+        ]
+
+    @staticmethod
+    def _load(table, records):
+        try:
+            for record in records:
+                table.insert(*record)
+        except KeyError as ke:
+            raise RouteExists from ke
+
+    def clone(self, exclude: t.Callable = None) -> "BoomRouter":
+        """Create a copy of this router (optionally without the routes and
+        middlewares ``exclude`` returns ``True`` for) to be changed off to the
+        side and then put in place with :meth:`swap`.
+        """
+        router = self.__class__()
+        router.converters = dict(self.converters)
+        records = self._table.records
+        if exclude is not None:
+            records = [r for r in records if not exclude(r[3])]
+        self._load(router._table, records)
+        return router
+
+    def swap(self, router: "BoomRouter") -> t.Set[t.Union[Route, Middleware]]:
+        """Atomically replace the route table being served with the one from
+        ``router``. If routes were only removed, the cached lookups of the
+        ones still there are kept; if anything was added, nothing is (a new
+        route may be a better match for an URL already cached). Returns the
+        routes and middlewares that are gone.
+        """
+        old, new = self._table, router._table
+        old_items = {r[3] for r in old.records}
+        new_items = {r[3] for r in new.records}
+        gone = old_items - new_items
+
+        if new_items - old_items:
+            pass  # everything is looked up again
+        elif not gone:
+            # nothing changed, so everything cached is still valid
+            new.cache.update(old.cache)
+            new.allowed_cache.update(old.allowed_cache)
+        elif not any(isinstance(i, Middleware) for i in gone):
+            for key, ret in tuple(old.cache.items()):
+                # it's safe to keep lookups of routes that are still there
+                if ret.__class__ is tuple and ret[0] in new_items:
+                    new.cache[key] = ret
+
+        # this is the only thing requests see, no locks needed
+        self._table = new
+        return gone
+
     def find_route_by_view_name(self, view_name):
         # ------------------------------------------------------------------- #
         # code taken and adapted from the Sanic router
@@ -94,40 +447,57 @@ class BoomRouter:
         if not view_name:
             return (None, None)
 
-        return self.routes_names.get(view_name, (None, None))
+        return self._table.routes_names.get(view_name, (None, None))
 
     def get(self, request):
-        return self._get(request.path, request.method)
+        table = self._table
+        host = None
+        if table.hosts:
+            host = table.find_host(request.host)
+        ret = table.get(request.path, request.method, host)
 
-    @lru_cache(maxsize=ROUTER_CACHE_SIZE)
-    def _get(self, url, method):
-        # url "normalization", there is no strict slashes for mental sakeness
-        url = url.strip()
+        if ret.__class__ is MethodNotSupported:
+            # cached, so the traceback is reset not to pile up
+            raise ret.with_traceback(None)
+        return ret
 
-        if url.count("/") > 1 and url[-1] == "/":
-            url = url[:-1]  # yes, yes yes and yes! (:
-        route, middlewares, params = self._tree.get(url, method)
+    def allowed_methods(self, request) -> t.FrozenSet[str]:
+        """The (cached) set of methods allowed for the requested URL, which
+        is empty if the URL is not found at all.
+        """
+        table = self._table
+        host = None
+        if table.hosts:
+            host = table.find_host(request.host)
+        return table.allowed(request.path, host)
 
-        if route is self._tree.sentinel:
-            raise MethodNotSupported(
-                "Method {} not allowed for URL {}".format(method, url),
-                method=method,
-                allowed_methods=self.get_supported_methods(url),
-            )
-        elif route is None:
-            raise NotFound("Requested URL {} not found".format(url))
-        # ------------------------------------------------------------------- #
-        # code taken and adapted from the Sanic router
-        # ------------------------------------------------------------------- #
-        route_handler = route.handler
+    def get_supported_methods(self, url, host=None):
+        table = self._table
+        if host is not None:
+            host = table.find_host(host)
+        return table.allowed(url, host)
 
-        if hasattr(route_handler, "handlers"):  # noqa
-            # W-W-WHY ?! I don't even know what this is or why is it here
-            route_handler = route_handler.handlers[method]
-        return route_handler, middlewares, params, route.uri
+    def add_converter(
+        self, name: str, pattern: str, cast: t.Callable = str
+    ) -> None:
+        """Register a new type to be used on route parameters, like
+        ``/items/:id<name>``. The parameter value must fully match the given
+        regular expression and is then converted using ``cast``.
+        """
+        self.converters[name] = (pattern, cast)
+
+    def _compile_uri(self, uri):
+        converters = []
+
+        def strip_type(match):
+            name, kind = match.group(2), match.group(3)
+            # unknown types are treated as a regular expression
+            pattern, cast = self.converters.get(kind, (kind, str))
+            converters.append((name, re.compile(pattern), cast))
+            return match.group(1) + name
 
-    def get_supported_methods(self, url):
-        return self._tree.methods_for(url)
+        path = _TYPED_PARAM.sub(strip_type, uri)
+        return path, tuple(converters)
 
     def is_stream_handler(self, request):
         warnings.warn(
@@ -142,4 +512,4 @@ class BoomRouter:
         return False
 
 
-__all__ = ("BoomRouter",)
+__all__ = ("BoomRouter", "RouteTable")
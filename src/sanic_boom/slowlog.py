@@ -0,0 +1,58 @@
+import typing as t
+from collections import deque
+from time import time
+
+from sanic_boom.tracing import Trace, Tracer
+
+
+class SlowRequestLog(Tracer):
+    """Keeps the last ``size`` requests that took ``threshold`` seconds or
+    more, with the duration of each stage of ``handle_request`` and of every
+    component resolved (and if it came from the cache or not).
+    """
+
+    def __init__(self, threshold: float = 1.0, size: int = 100):
+        self.threshold = threshold
+        self.entries = deque(maxlen=size)
+
+    def on_finish(self, trace: Trace, request, response) -> None:
+        duration = trace.span.duration
+        if duration is None or duration < self.threshold:
+            return
+        self.entries.append(self.entry(trace, duration))
+
+    def entry(self, trace: Trace, duration: float) -> t.Dict[str, t.Any]:
+        attributes = trace.span.attributes
+        stages = []
+        components = []
+
+        for span in trace.spans:
+            if span.attributes.get("stage"):
+                stages.append({"name": span.name, "duration": span.duration})
+            elif span.name == "component":
+                component = {
+                    k: span.attributes.get(k)
+                    for k in ("component", "param", "lifecycle", "cache")
+                }
+                component["stage"] = span.attributes.get("parent")
+                component["duration"] = span.duration
+                components.append(component)
+
+        return {
+            "time": time(),
+            "method": attributes.get("method"),
+            "path": attributes.get("path"),
+            "uri_template": attributes.get("uri_template"),
+            "status": attributes.get("status"),
+            "exception": attributes.get("exception"),
+            "cancelled": attributes.get("cancelled", False),
+            "duration": duration,
+            "stages": stages,
+            "components": components,
+        }
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+__all__ = ("SlowRequestLog",)
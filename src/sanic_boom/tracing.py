@@ -0,0 +1,93 @@
+import typing as t
+from time import perf_counter
+
+ROUTING = "routing"
+REQUEST_MIDDLEWARE = "request_middleware"
+LAYERED_REQUEST_MIDDLEWARE = "layered_request_middleware"
+RESOLVE = "resolve"
+HANDLER = "handler"
+RESPONSE_MIDDLEWARE = "response_middleware"
+LAYERED_RESPONSE_MIDDLEWARE = "layered_response_middleware"
+WRITE = "write"
+
+
+class Span:
+    __slots__ = ("name", "start", "end", "attributes")
+
+    def __init__(self, name: str, attributes: t.Dict[str, t.Any] = None):
+        self.name = name
+        self.start = perf_counter()
+        self.end = None
+        self.attributes = attributes if attributes is not None else {}
+
+    @property
+    def duration(self) -> t.Optional[float]:
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def finish(self) -> None:
+        if self.end is None:
+            self.end = perf_counter()
+
+    def __repr__(self):
+        return "<Span name: {}, duration: {}>".format(self.name, self.duration)
+
+
+class Trace:
+    """All the spans of a single request. Stages of ``handle_request`` are
+    sequential (entering one finishes the previous); other spans (like the
+    resolution of a component) may be started at any time, and are linked to
+    the stage they happened in. Timestamps come from ``time.perf_counter``.
+    """
+
+    __slots__ = ("span", "stage", "spans")
+
+    def __init__(self, method: str, path: str):
+        self.span = Span("request", {"method": method, "path": path})
+        self.stage = None
+        self.spans = []
+
+    @property
+    def uri_template(self) -> t.Optional[str]:
+        return self.span.attributes.get("uri_template")
+
+    def enter(self, name: str) -> Span:
+        if self.stage is not None:
+            self.stage.finish()
+        self.stage = Span(name, {"stage": True})
+        self.spans.append(self.stage)
+        return self.stage
+
+    def start(self, name: str, **attributes) -> Span:
+        if self.stage is not None:
+            attributes["parent"] = self.stage.name
+        span = Span(name, attributes)
+        self.spans.append(span)
+        return span
+
+    def finish(self) -> None:
+        if self.stage is not None:
+            self.stage.finish()
+            self.stage = None
+        self.span.finish()
+
+    @property
+    def stages(self) -> t.List[Span]:
+        return [s for s in self.spans if s.attributes.get("stage")]
+
+
+class Tracer:
+    """Base class for anything that wants to know about traces, like an
+    adapter to an OpenTelemetry exporter. Tracers are only called if added to
+    the application, through :meth:`SanicBoom.add_tracer`.
+    """
+
+    def on_start(self, trace: Trace, request) -> None:
+        pass
+
+    def on_finish(self, trace: Trace, request, response) -> None:
+        pass
+
+
+__all__ = ("Span", "Trace", "Tracer")
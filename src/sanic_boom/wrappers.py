@@ -1,4 +1,12 @@
+import re
+import typing as t
 from enum import IntEnum
+from urllib.parse import quote
+
+from sanic.exceptions import URLBuildError
+
+_URI_PARAM = re.compile(r"([:\*])([^/<]+)(?:<.+?>(?=/|$))?")
+_INVALID_VALUE_CHARS = frozenset(":|*")
 
 
 class MiddlewareType(IntEnum):
@@ -6,12 +14,89 @@ class MiddlewareType(IntEnum):
     RESPONSE = 2
 
 
+class URLTemplate:
+    """A precompiled representation of an URI, splitted into its static
+    segments and parameter slots, so building an URL out of it is nothing but
+    a concatenation.
+    """
+
+    __slots__ = ("uri", "segments", "params", "names")
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.segments = []
+        self.params = []
+        position = 0
+
+        for match in _URI_PARAM.finditer(uri):
+            self.segments.append(uri[position : match.start()])
+            self.params.append((match.group(2), match.group(1) == "*"))
+            position = match.end()
+
+        self.segments.append(uri[position:])
+        self.names = frozenset(name for name, _ in self.params)
+
+    def build(self, values: dict) -> str:
+        if not self.params:
+            return self.uri
+
+        parts = [self.segments[0]]
+
+        for (name, is_glob), segment in zip(self.params, self.segments[1:]):
+            if name not in values:
+                raise URLBuildError(
+                    "Required parameters for URL `{}` was not passed to "
+                    "url_for".format(self.uri)
+                )
+            value = str(values[name])
+
+            if not _INVALID_VALUE_CHARS.isdisjoint(value):
+                raise URLBuildError(
+                    "The parameter '{}' passed for URL `{}` with the value of "
+                    "'{}' may contain invalid characters that can break the "
+                    "URL".format(name, self.uri, value)
+                )
+
+            parts.append(quote(value, safe="/" if is_glob else ""))
+            parts.append(segment)
+
+        return "".join(parts)
+
+    def __repr__(self):
+        return "<URLTemplate uri: {}>".format(self.uri)
+
+
 class Route:
-    def __init__(self, name: str, handler: object, methods: set, uri: str):
+    def __init__(
+        self,
+        name: str,
+        handler: object,
+        methods: set,
+        uri: str,
+        host: t.Union[str, t.List[str]] = None,
+        converters: t.Tuple[t.Tuple[str, t.Pattern, t.Callable], ...] = (),
+    ):
         self.name = name
         self.handler = handler
         self.methods = methods
         self.uri = uri
+        self.host = host
+        self.converters = converters
+        self.template = URLTemplate(uri)
+        # set by SanicBoom.freeze for handlers that don't need the resolver
+        self.fast_path = None
+        # set by SanicBoom.freeze for handlers decorated with cache_response
+        # and coalesce_requests
+        self.cache_policy = None
+        self.coalesce_policy = None
+        # set by SanicBoom.freeze for handlers decorated with run_in_thread
+        # or run_in_process
+        self.offload = None
+        # set by SanicBoom.freeze for handlers decorated with RateLimit,
+        # ConcurrencyLimit and with_deadline
+        self.rate_limit = None
+        self.concurrency_limit = None
+        self.deadline = None
 
     def __repr__(self):
         return "<Route name: {}, methods: {}, uri: {}>".format(
@@ -0,0 +1,85 @@
+import asyncio
+
+import aiohttp
+import pytest
+from sanic.response import json, text
+
+from sanic_boom import ConcurrencyLimit
+
+
+def test_concurrency_limit(app):
+    group = ConcurrencyLimit(1, queue=1, retry_after=5)
+
+    @app.get("/slow/:name")
+    @group
+    async def slow_handler(name):
+        await asyncio.sleep(0.1)
+        return text(name)
+
+    @app.get("/other")
+    @group
+    async def other_handler():
+        return text("other")
+
+    @app.get("/fast")
+    async def fast_handler():
+        return text("fast")
+
+    @app.get("/fan-out")
+    async def fan_out_handler(request):
+        port = request.transport.get_extra_info("sockname")[1]
+
+        async def fetch(session, path, delay):
+            await asyncio.sleep(delay)
+            url = "http://127.0.0.1:{}{}".format(port, path)
+            async with session.get(url) as response:
+                return [
+                    response.status,
+                    await response.text(),
+                    response.headers.get("Retry-After"),
+                ]
+
+        async with aiohttp.ClientSession() as session:
+            responses = await asyncio.gather(
+                fetch(session, "/slow/first", 0),
+                fetch(session, "/slow/second", 0.02),
+                fetch(session, "/other", 0.04),
+                fetch(session, "/fast", 0.04),
+            )
+        return json(responses)
+
+    request, response = app.test_client.get("/fan-out")
+    assert response.json == [
+        [200, "first", None],
+        [200, "second", None],  # waited for the first one
+        [503, "Service Unavailable", "5"],
+        [200, "fast", None],
+    ]
+    assert (group.active, group.waiting, group.rejected) == (0, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_timeout():
+    limit = ConcurrencyLimit(1, queue=1, timeout=0.05)
+    assert await limit.acquire()
+
+    waiter = asyncio.ensure_future(limit.acquire())
+    await asyncio.sleep(0)
+    assert limit.waiting == 1
+    assert await limit.acquire() is False  # the queue is full
+
+    limit.release()
+    assert await waiter
+    assert limit.active == 1
+
+    assert await limit.acquire() is False  # timed out
+    assert (limit.waiting, limit.rejected) == (0, 2)
+
+    waiter = asyncio.ensure_future(limit.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limit.waiting == 0
+    limit.release()
+    assert limit.active == 0
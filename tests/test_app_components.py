@@ -1,11 +1,14 @@
+import asyncio
 import inspect
 import json
 import typing as t
 import uuid
 
+import pytest
 from sanic.response import text
 
-from sanic_boom import Component, ComponentCache
+from sanic_boom import Component, ComponentCache, lifespan
+from sanic_boom.exceptions import InvalidComponent
 
 
 class JSONBody:
@@ -149,3 +152,169 @@ def test_cached_component(app):
     request, response = app.test_client.get("/uuid")
     assert response.status == 200
     assert request[response.text] == 2
+
+
+EVENTS = []
+
+
+class Pool:
+    pass
+
+
+class Cache:
+    pass
+
+
+class Repository:
+    pass
+
+
+class PoolComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Pool
+
+    async def startup(self):
+        EVENTS.append("pool starting")
+        await asyncio.sleep(0.01)
+        self.pool = "pool"
+        EVENTS.append("pool started")
+
+    async def shutdown(self):
+        EVENTS.append("pool stopped")
+
+    async def get(self):
+        return self.pool
+
+
+class CacheComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Cache
+
+    async def __aenter__(self):
+        EVENTS.append("cache starting")
+        await asyncio.sleep(0.01)
+        EVENTS.append("cache started")
+
+    async def __aexit__(self, *exc_info):
+        EVENTS.append("cache stopped")
+        raise ValueError("not a problem")
+
+    async def get(self):
+        return "cache"
+
+
+class RepositoryComponent(Component):
+    depends_on = (PoolComponent, CacheComponent)
+
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Repository
+
+    async def startup(self):
+        EVENTS.append("repository started")
+
+    async def shutdown(self):
+        EVENTS.append("repository stopped")
+
+    async def get(self, pool: Pool, cache: Cache):
+        return "{} and {}".format(pool, cache)
+
+
+def test_component_lifespan(app):
+    EVENTS.clear()
+    # the order they're added doesn't matter
+    app.add_component(RepositoryComponent)
+    app.add_component(PoolComponent)
+    app.add_component(CacheComponent)
+
+    @app.get("/")
+    async def handler(repository: Repository):
+        return text(repository)
+
+    request, response = app.test_client.get("/")
+    assert response.text == "pool and cache"
+    assert EVENTS == [
+        "pool starting",
+        "cache starting",
+        "pool started",
+        "cache started",
+        "repository started",
+        "repository stopped",
+        "pool stopped",
+        "cache stopped",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_component_lifespan_circular(app):
+    class First(Component):
+        pass
+
+    class Second(Component):
+        depends_on = (First,)
+
+    First.depends_on = (Second,)
+    app.add_component(First)
+    app.add_component(Second)
+
+    with pytest.raises(ValueError):
+        await lifespan.startup(app.resolver.components)
+
+
+class Connection:
+    pass
+
+
+class ConnectionComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Connection
+
+    async def get(self, param: inspect.Parameter):
+        EVENTS.append("acquired " + param.name)
+        yield param.name
+        await asyncio.sleep(0.01)
+        EVENTS.append("released " + param.name)
+        if param.name == "broken":
+            raise ValueError("oops")
+
+
+@pytest.mark.parametrize("tasks", [0, 100])
+def test_generator_component(app, tasks):
+    EVENTS.clear()
+    app.config.BOOM_TEARDOWN_TASKS = tasks
+    app.add_component(ConnectionComponent)
+
+    @app.get("/")
+    async def handler(first: Connection, broken: Connection):
+        EVENTS.append("handler")
+        return text(first)
+
+    @app.middleware(attach_to="response")
+    async def response_middleware(request, response):
+        EVENTS.append("response")
+
+    request, response = app.test_client.get("/")
+    assert response.text == "first"
+    assert EVENTS == [
+        "acquired first",
+        "acquired broken",
+        "handler",
+        "response",
+        "released broken",
+        "released first",
+    ]
+    assert not app._teardown_tasks
+
+
+def test_generator_component_lifecycle(app):
+    class RequestConnectionComponent(ConnectionComponent):
+        def get_cache_lifecycle(self):
+            return ComponentCache.REQUEST
+
+    class EndpointConnectionComponent(ConnectionComponent):
+        def get_cache_lifecycle(self):
+            return ComponentCache.ENDPOINT
+
+    app.add_component(RequestConnectionComponent)
+    with pytest.raises(InvalidComponent):
+        app.add_component(EndpointConnectionComponent)
+    assert len(app.resolver.components) == 1
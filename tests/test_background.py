@@ -0,0 +1,50 @@
+import asyncio
+
+from sanic.response import text
+
+from sanic_boom import BackgroundTasks, TaskQueue
+
+
+def test_background_tasks(app):
+    app.enable_background_tasks(concurrency=2, max_size=4)
+    app.enable_metrics(uri="/metrics")
+    events = []
+
+    async def audit(name):
+        await asyncio.sleep(0.05)
+        events.append("audit " + name)
+
+    def broken():
+        raise ValueError("oops")
+
+    @app.middleware
+    async def request_middleware(request, tasks: BackgroundTasks):
+        tasks.add(events.append, "middleware")
+
+    @app.get("/")
+    async def handler(tasks: BackgroundTasks):
+        tasks.add(broken)
+        for name in ("first", "second", "third"):
+            tasks.add(audit, name=name)
+        events.append("handler")
+        return text("OK")
+
+    request, response = app.test_client.get("/")
+    assert response.text == "OK"
+    # drained when the server stopped
+    assert events[:2] == ["handler", "middleware"]
+    assert sorted(events[2:]) == ["audit first", "audit second"]
+
+    queue = app.background_tasks
+    # the last one didn't fit in the queue
+    assert (queue.completed, queue.failed, queue.rejected) == (3, 1, 1)
+    assert queue.queued == queue.active == 0
+
+    request, response = app.test_client.get("/metrics")
+    assert "sanic_boom_background_rejected_total 1" in response.text
+
+
+def test_task_queue_not_started():
+    queue = TaskQueue()
+    assert queue.submit(print, "never") is False
+    assert queue.rejected == 1
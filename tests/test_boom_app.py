@@ -285,3 +285,71 @@ def test_response_no_gather(app):
     response = app.test_client.get("/foo", gather_request=False)
     assert response.status == 200
     assert response.text == "OK from handler"
+
+
+def test_fast_path(app):
+    app.add_component(FakeComponent)
+
+    @app.get("/plain/:item_id<int>/:name")
+    async def plain_handler(req, item_id, name):
+        assert isinstance(req, BoomRequest)
+        return text("{} {}".format(item_id + 1, name))
+
+    @app.get("/no-request")
+    def no_request_handler():
+        return text("OK")
+
+    @app.get("/annotated/:item_id")
+    async def annotated_handler(item_id: int):
+        return text(str(item_id + 1))
+
+    @app.get("/ignored/:item_id")
+    async def ignored_handler(request):
+        return text("ignored")
+
+    @app.get("/layered")
+    async def layered_handler(request):
+        return text(request["layered"])
+
+    @app.middleware(uri="/layered")
+    async def layered_middleware(request):
+        request["layered"] = "layered"
+
+    app.freeze()
+
+    assert app.router.find_route_by_view_name("plain_handler")[
+        1
+    ].fast_path == ("req",)
+    assert (
+        app.router.find_route_by_view_name("no_request_handler")[1].fast_path
+        == tuple()
+    )
+    assert (
+        app.router.find_route_by_view_name("annotated_handler")[1].fast_path
+        is None
+    )
+    assert (
+        app.router.find_route_by_view_name("ignored_handler")[1].fast_path
+        is None
+    )
+
+    async def _handle(*args, **kwargs):
+        raise Exception("the resolver should not be called")
+
+    original_handle = app._handle
+    app._handle = _handle
+
+    request, response = app.test_client.get("/plain/41/foo")
+    assert response.text == "42 foo"
+    request, response = app.test_client.get("/no-request")
+    assert response.text == "OK"
+
+    app._handle = original_handle
+
+    request, response = app.test_client.get("/annotated/41")
+    assert response.text == "42"
+    request, response = app.test_client.get("/layered")
+    assert response.text == "layered"
+    request, response = app.test_client.get("/ignored/41")
+    assert response.status == 200
+    assert response.text == "ignored"
@@ -1,10 +1,11 @@
+import asyncio
 import inspect
 import typing as t
 
 import pytest
 from sanic.request import Request
 
-from sanic_boom import Component, Resolver
+from sanic_boom import BatchComponent, Component, Resolver
 from sanic_boom.exceptions import InvalidComponent, NoApplicationFound
 
 
@@ -134,3 +135,102 @@ async def test_resolver_no_function(sanic_request):
 
     with pytest.raises(TypeError):
         await resolver.resolve(request=sanic_request, func={})
+
+
+# --------------------------------------------------------------------------- #
+# batching
+# --------------------------------------------------------------------------- #
+
+
+class User:
+    pass
+
+
+class Abort(BaseException):
+    pass
+
+
+class UserComponent(BatchComponent):
+    def __init__(self, app):
+        super().__init__(app)
+        self.batches = []
+
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == User
+
+    async def get(self, param: inspect.Parameter):
+        return await self.load(param.name.split("_")[0])
+
+    async def get_many(self, keys):
+        self.batches.append(keys)
+        if "error" in keys:
+            raise ValueError("oops")
+        if "cancel" in keys:
+            raise Abort()  # a BaseException, like CancelledError on 3.8+
+        return {k: k.upper() for k in keys if k != "missing"}
+
+
+@pytest.mark.asyncio
+async def test_batch_component(some_app, sanic_request):
+    some_app.add_component(UserComponent)
+    component = some_app.resolver.components[0]
+
+    async def first(alice_user: User, bob_user: User):
+        pass
+
+    async def second(alice_friend: User, missing_user: User):
+        pass
+
+    results = await asyncio.gather(
+        some_app.resolver.resolve(request=sanic_request, func=first),
+        some_app.resolver.resolve(request=sanic_request, func=second),
+    )
+    assert results == [
+        {"alice_user": "ALICE", "bob_user": "BOB"},
+        {"alice_friend": "ALICE", "missing_user": None},
+    ]
+    # the same key, from concurrent requests, is loaded only once
+    assert component.batches == [["alice"], ["bob", "missing"]]
+
+    async def third(error_user: User):
+        pass
+
+    UserComponent.max_batch_size = 1
+    try:
+        with pytest.raises(ValueError):
+            await some_app.resolver.resolve(request=sanic_request, func=third)
+        results = await asyncio.gather(
+            some_app.resolver.resolve(request=sanic_request, func=first),
+            some_app.resolver.resolve(request=sanic_request, func=second),
+        )
+    finally:
+        UserComponent.max_batch_size = None
+    assert component.batches[2:] == [
+        ["error"],
+        ["alice"],
+        ["alice"],
+        ["bob"],
+        ["missing"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_component_cancelled(some_app, sanic_request):
+    some_app.add_component(UserComponent)
+
+    async def func(cancel_user: User, cancel_friend: User):
+        pass
+
+    async def other(cancel_other: User):
+        pass
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            some_app.resolver.resolve(request=sanic_request, func=func),
+            some_app.resolver.resolve(request=sanic_request, func=other),
+            return_exceptions=True,
+        ),
+        1,
+    )
+    # no one is left waiting for the batch
+    assert [type(r) for r in results] == [asyncio.CancelledError] * 2
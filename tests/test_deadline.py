@@ -0,0 +1,88 @@
+import asyncio
+import inspect
+
+from sanic.response import json
+
+from sanic_boom import Component, Deadline, with_deadline
+
+EVENTS = []
+
+
+class Recommendations:
+    pass
+
+
+class RecommendationsComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Recommendations
+
+    async def get(self, deadline: Deadline):
+        if deadline.remaining < 0.05:
+            return []  # optional, not worth it
+        try:
+            await asyncio.sleep(0.2)
+        except asyncio.CancelledError:
+            EVENTS.append("cancelled")
+            raise
+        return ["something"]
+
+
+def test_deadline(app):
+    EVENTS.clear()
+    app.add_component(RecommendationsComponent)
+
+    @app.get("/tight")
+    @with_deadline(0.01)
+    async def tight_handler(recommendations: Recommendations):
+        return json(recommendations)
+
+    @app.get("/short")
+    @with_deadline(0.1)
+    async def short_handler(recommendations: Recommendations):
+        return json(recommendations)
+
+    @app.get("/long")
+    @with_deadline(1)
+    async def long_handler(recommendations: Recommendations, d: Deadline):
+        return json([recommendations, d.timeout, d.remaining < 1])
+
+    @app.get("/none")
+    async def none_handler(deadline: Deadline):
+        return json([deadline.remaining == float("inf"), deadline.expired])
+
+    request, response = app.test_client.get("/tight")
+    assert response.json == []
+
+    request, response = app.test_client.get("/short")
+    assert response.status == 503
+    assert EVENTS == ["cancelled"]
+
+    request, response = app.test_client.get("/long")
+    assert response.json == [["something"], 1, True]
+
+    request, response = app.test_client.get("/none")
+    assert response.json == [True, False]
+
+
+def test_default_deadline(app):
+    app.config.BOOM_DEADLINE = 0.05
+
+    @app.get("/")
+    async def handler():
+        await asyncio.sleep(0.2)
+
+    @app.get("/plain/:name")
+    def plain_handler(request, name):
+        return json(name)
+
+    app.freeze()
+    # deadlines don't take the fast path away
+    route = app.router.find_route_by_view_name("plain_handler")[1]
+    assert (route.fast_path, route.deadline) == (("request",), 0.05)
+    route = app.router.find_route_by_view_name("handler")[1]
+    assert route.fast_path == ()
+
+    request, response = app.test_client.get("/")
+    assert response.status == 503
+    request, response = app.test_client.get("/plain/foo")
+    assert response.json == "foo"
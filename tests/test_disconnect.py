@@ -0,0 +1,96 @@
+import asyncio
+import inspect
+
+from sanic.response import text
+
+from sanic_boom import Component
+
+EVENTS = []
+
+
+class Connection:
+    pass
+
+
+class Report:
+    pass
+
+
+class ConnectionComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Connection
+
+    async def get(self):
+        EVENTS.append("acquired")
+        yield "connection"
+        EVENTS.append("released")
+
+
+class ReportComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Report
+
+    async def get(self, connection: Connection):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            EVENTS.append("cancelled")
+            raise
+        EVENTS.append("finished")  # pragma: no cover
+        return "report"
+
+
+def test_client_disconnect(app):
+    EVENTS.clear()
+    app.enable_metrics(uri="/metrics")
+    app.add_component(ConnectionComponent)
+    app.add_component(ReportComponent)
+
+    @app.get("/report")
+    async def report_handler(report: Report):
+        return text(report)  # pragma: no cover
+
+    @app.get("/impatient")
+    async def impatient_handler(request):
+        port = request.transport.get_extra_info("sockname")[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /report HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await asyncio.sleep(0.1)
+        writer.close()  # the client is gone
+        await asyncio.sleep(0.1)
+        return text("OK")
+
+    request, response = app.test_client.get("/impatient")
+    assert response.text == "OK"
+    assert EVENTS == ["acquired", "cancelled", "released"]
+
+    request, response = app.test_client.get("/metrics")
+    assert (
+        "sanic_boom_requests_disconnected_total{"
+        'route="/report",method="GET"} 1' in response.text.splitlines()
+    )
+
+
+def test_response_timeout_is_not_a_disconnect(app):
+    EVENTS.clear()
+    app.config.RESPONSE_TIMEOUT = 1  # the server clock ticks every second
+    app.enable_metrics(uri="/metrics")
+    app.add_component(ConnectionComponent)
+    app.add_component(ReportComponent)
+
+    @app.get("/report")
+    async def report_handler(report: Report):
+        return text(report)  # pragma: no cover
+
+    request, response = app.test_client.get("/report")
+    assert response.status == 503
+    assert EVENTS == ["acquired", "cancelled", "released"]
+    assert not request.disconnected
+
+    request, response = app.test_client.get("/metrics")
+    assert "sanic_boom_requests_disconnected_total{" not in response.text
+    assert (
+        "sanic_boom_requests_total{"
+        'route="/report",method="GET",status="none"} 1'
+        in response.text.splitlines()
+    )
@@ -0,0 +1,147 @@
+import asyncio
+import inspect
+import os
+import threading
+import time
+
+import pytest
+from sanic.response import json, text
+
+from sanic_boom import (
+    Component,
+    ProcessPool,
+    ThreadPool,
+    run_in_process,
+    run_in_thread,
+)
+from sanic_boom.exceptions import ExecutorFull
+
+
+class Connection:
+    pass
+
+
+class ConnectionComponent(Component):
+    executor = "db"
+
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Connection
+
+    def get(self):  # a blocking driver
+        return threading.current_thread().name
+
+
+def test_run_in_thread(app):
+    app.enable_metrics(uri="/metrics")
+    app.add_executor("db", max_workers=2)
+    app.add_component(ConnectionComponent)
+
+    @app.get("/sync")
+    @run_in_thread()
+    def sync_handler(request, connection: Connection):
+        return json([connection, threading.current_thread().name])
+
+    @app.get("/async")
+    async def async_handler(connection: Connection):
+        return text(connection)
+
+    request, response = app.test_client.get("/sync")
+    assert response.status == 200
+    component_thread, handler_thread = response.json
+    assert component_thread.startswith("sanic-boom-db")
+    assert handler_thread.startswith("sanic-boom-default")
+
+    request, response = app.test_client.get("/async")
+    assert response.text.startswith("sanic-boom-db")
+
+    request, response = app.test_client.get("/metrics")
+    lines = response.text.splitlines()
+    assert 'sanic_boom_executor_completed_total{executor="db"} 2' in lines
+    assert 'sanic_boom_executor_queued{executor="default"} 0' in lines
+    # threads are gone with the server
+    assert app.executors["db"]._executor is None
+
+
+@run_in_process(limit=1, timeout=5)
+def pid_handler(value: int):
+    return json([value ** 2, os.getpid()])
+
+
+@run_in_process(timeout=0.1)
+def slow_handler():
+    time.sleep(0.5)
+    return text("too late")
+
+
+def test_run_in_process(app):
+    app.route("/square/:value")(pid_handler)
+    app.route("/slow")(slow_handler)
+
+    request, response = app.test_client.get("/square/4")
+    assert response.status == 200
+    assert response.json[0] == 16
+    assert response.json[1] != os.getpid()
+
+    request, response = app.test_client.get("/slow")
+    assert response.status == 503
+
+    pool = app.executors["processes"]
+    assert isinstance(pool, ProcessPool)
+    assert pool.completed == 2
+    assert pool.active == 0
+
+
+def test_unknown_executor(app):
+    @app.get("/")
+    @run_in_thread("nope")
+    def handler():
+        return text("OK")
+
+    with pytest.raises(ValueError):
+        app.freeze()
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_queue():
+    pool = ThreadPool("test", max_workers=1, max_queue=1)
+    event = threading.Event()
+
+    calls = [asyncio.ensure_future(pool.run(event.wait, 1)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    assert (pool.active, pool.queued) == (1, 1)
+
+    with pytest.raises(ExecutorFull) as e:
+        await pool.run(event.wait, 1)
+    assert e.value.status_code == 503
+    assert pool.rejected == 1
+
+    event.set()
+    assert await asyncio.gather(*calls) == [True, True]
+    assert (pool.pending, pool.completed) == (0, 2)
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_cancelled_calls():
+    pool = ThreadPool("test", max_workers=1, max_queue=1)
+    event = threading.Event()
+
+    calls = [asyncio.ensure_future(pool.run(event.wait, 1)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    for call in calls:
+        call.cancel()
+    await asyncio.sleep(0)
+    # the queued call is gone, but the running one still takes its thread
+    assert (pool.pending, pool.active, pool.queued) == (1, 1, 0)
+
+    call = asyncio.ensure_future(pool.run(event.wait, 1))
+    await asyncio.sleep(0.05)
+    with pytest.raises(ExecutorFull):
+        await pool.run(event.wait, 1)
+
+    event.set()
+    assert await call is True
+    with pytest.raises(ZeroDivisionError):
+        await pool.run(lambda: 1 / 0)
+    assert (pool.pending, pool.completed, pool.failed) == (0, 2, 1)
+    pool.shutdown()
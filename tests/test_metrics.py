@@ -0,0 +1,112 @@
+import json
+import os
+
+from sanic.response import text
+
+from sanic_boom import Metrics
+from sanic_boom.metrics import render_stats
+
+
+def test_metrics_route(app):
+    app.enable_metrics(uri="/metrics", buckets=(0.1, 1.0))
+
+    @app.get("/items/:item_id<int>")
+    async def handler(item_id):
+        return text("OK")
+
+    for i in range(3):
+        request, response = app.test_client.get("/items/{}".format(i))
+        assert response.status == 200
+    request, response = app.test_client.get("/items/foo")
+    assert response.status == 404
+
+    request, response = app.test_client.get("/metrics")
+    assert response.status == 200
+    assert response.headers["Content-Type"] == "text/plain; version=0.0.4"
+    lines = response.text.splitlines()
+
+    assert (
+        'sanic_boom_requests_total{route="/items/:item_id<int>",'
+        'method="GET",status="2xx"} 3' in lines
+    )
+    assert (
+        'sanic_boom_requests_total{route="",method="GET",status="4xx"} 1'
+        in lines
+    )
+    assert (
+        "sanic_boom_request_duration_seconds_bucket{"
+        'route="/items/:item_id<int>",method="GET",le="+Inf"} 3' in lines
+    )
+    assert (
+        "sanic_boom_request_duration_seconds_count{"
+        'route="/items/:item_id<int>",method="GET"} 3' in lines
+    )
+
+
+def test_metrics_observe():
+    metrics = Metrics(buckets=(1.0, 0.1))
+    metrics.observe("/foo", "GET", 200, 0.05)
+    metrics.observe("/foo", "GET", 201, 0.5)
+    metrics.observe("/foo", "GET", 503, 5)
+    metrics.observe("/foo", "GET", None, 5)
+    metrics.observe("/foo", "GET", None, 0, disconnected=True)
+
+    route = metrics.routes[("/foo", "GET")]
+    assert route.count == 5
+    assert list(route.statuses) == [2, 0, 2, 0, 0, 1]
+    assert list(route.buckets) == [2, 1, 2]
+    assert route.sum == 10.55
+    assert route.disconnected == 1
+
+
+def test_metrics_aggregation(tmpdir):
+    directory = str(tmpdir)
+    metrics = Metrics(buckets=(0.1,), directory=directory)
+    metrics.observe('/foo"', "GET", 200, 0.05)
+
+    other = {
+        "buckets": [0.1],
+        "routes": [['/foo"', "GET", [1, 0, 2, 0, 0, 0], [1, 2], 1.0, 1]],
+    }
+    with open(os.path.join(directory, "sanic-boom-metrics-1.json"), "w") as fp:
+        json.dump(other, fp)
+    with open(os.path.join(directory, "sanic-boom-metrics-2.json"), "w") as fp:
+        json.dump({"buckets": [1.0], "routes": []}, fp)
+    with open(os.path.join(directory, "sanic-boom-metrics-3.json"), "w") as fp:
+        fp.write("{broken")
+
+    route = metrics.collect()[('/foo"', "GET")]
+    assert route.count == 4
+    assert list(route.buckets) == [2, 2]
+    assert route.disconnected == 1
+    assert 'route="/foo\\"",method="GET",status="2xx"} 3' in metrics.render()
+
+    metrics.dump()
+    with open(
+        os.path.join(
+            directory, "sanic-boom-metrics-{}.json".format(os.getpid())
+        )
+    ) as fp:
+        assert json.load(fp) == metrics.snapshot()
+
+
+def test_render_stats():
+    class Pool:
+        active = 1
+        done = 2
+
+    text = render_stats(
+        "foo_",
+        (("active", "gauge", "Active"), ("done", "counter", "Done")),
+        (({"name": 'a"b'}, Pool()), ({}, Pool())),
+    )
+    assert text.splitlines() == [
+        "# HELP foo_active Active.",
+        "# TYPE foo_active gauge",
+        'foo_active{name="a\\"b"} 1',
+        "foo_active 1",
+        "# HELP foo_done_total Done.",
+        "# TYPE foo_done_total counter",
+        'foo_done_total{name="a\\"b"} 2',
+        "foo_done_total 2",
+    ]
@@ -0,0 +1,55 @@
+import inspect
+import time
+
+from sanic.response import text
+
+from sanic_boom import Component, with_deadline
+
+
+class Slow:
+    pass
+
+
+class SlowComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Slow
+
+    async def get(self):
+        time.sleep(0.3)  # an accidental blocking call
+        return "slow"
+
+
+def test_loop_monitor(app):
+    app.enable_loop_monitor(threshold=0.1, interval=0.01)
+    app.add_component(SlowComponent)
+
+    @app.get("/slow")
+    async def handler(slow: Slow):
+        return text(slow)
+
+    @app.get("/deadline")
+    @with_deadline(5)
+    async def deadline_handler(slow: Slow):
+        return text(slow)
+
+    request, response = app.test_client.get("/slow")
+    assert response.text == "slow"
+
+    monitor = app.loop_monitor
+    assert not monitor.running
+    assert monitor.max_lag >= 0.1
+    assert len(monitor.reports) == 1
+
+    report = monitor.reports[0]
+    assert report["route"] == "GET /slow"
+    assert report["component"] == "SlowComponent"
+    assert report["stage"] is None  # no tracing
+    assert report["blocked"] >= 0.1
+    assert "time.sleep(0.3)" in report["stack"][-1]
+
+    # deadlines don't hide the route from the monitor
+    request, response = app.test_client.get("/deadline")
+    assert response.text == "slow"
+    report = monitor.reports[-1]
+    assert report["route"] == "GET /deadline"
+    assert report["component"] == "SlowComponent"
@@ -0,0 +1,61 @@
+import threading
+
+from sanic.response import text
+
+from sanic_boom import SamplingProfiler
+from sanic_boom.profiler import IDLE
+
+
+def test_profiler_sample():
+    profiler = SamplingProfiler()
+    profiler._thread_id = threading.get_ident()
+
+    def inner():
+        profiler.sample()
+
+    profiler.sample()
+    inner()
+
+    routes = profiler.routes()
+    assert routes == {IDLE: 2}
+
+    lines = profiler.collapsed().splitlines()
+    assert len(lines) == 2
+    assert all(line.startswith(IDLE + ";") for line in lines)
+    assert any("inner (test_profiler.py:" in line for line in lines)
+    assert profiler.collapsed("GET /foo") == ""
+
+    profiler.reset()
+    assert profiler.collapsed() == ""
+
+
+def test_profiler_route(app):
+    app.config.BOOM_PROFILER = True
+    app.enable_profiler(uri="/_profiler/", interval=60)
+
+    @app.get("/items/:item_id")
+    async def handler(item_id):
+        app.profiler.sample()
+        return text("OK")
+
+    request, response = app.test_client.get("/items/1")
+    assert response.status == 200
+    assert not app.profiler.running
+    assert app.profiler.routes() == {"GET /items/:item_id": 1}
+    assert app.profiler._frames == {}
+
+    request, response = app.test_client.get(
+        "/_profiler", params={"route": "GET /items/:item_id"}
+    )
+    assert response.status == 200
+    assert response.text.startswith("GET /items/:item_id;")
+    assert "handler (test_profiler.py:" in response.text
+    assert response.text.endswith(" 1\n")
+
+    request, response = app.test_client.post("/_profiler/reset")
+    assert response.status == 204
+    request, response = app.test_client.get("/_profiler")
+    assert response.text == ""
+
+    request, response = app.test_client.post("/_profiler/foo")
+    assert response.status == 404
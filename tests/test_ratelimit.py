@@ -0,0 +1,94 @@
+import inspect
+
+from sanic.response import text
+
+from sanic_boom import Component, RateLimit
+
+
+class ApiKey(str):
+    pass
+
+
+class Expensive:
+    pass
+
+
+class ApiKeyComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == ApiKey
+
+    async def get(self, request):
+        return request.headers.get("X-Api-Key")
+
+
+class ExpensiveComponent(Component):
+    resolved = 0
+
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Expensive
+
+    async def get(self):
+        ExpensiveComponent.resolved += 1
+        return "expensive"
+
+
+def test_rate_limit_by_address(app):
+    limit = RateLimit(0.01, burst=2)
+
+    @app.get("/")
+    @limit
+    async def handler():
+        return text("OK")
+
+    statuses = [app.test_client.get("/")[1] for _ in range(3)]
+    assert [r.status for r in statuses] == [200, 200, 429]
+    assert statuses[-1].headers["Retry-After"] == "100"
+    assert limit.rejected == 1
+    assert list(limit.buckets.slots) == ["127.0.0.1"]
+
+
+def test_rate_limit_by_component(app):
+    ExpensiveComponent.resolved = 0
+    app.add_component(ApiKeyComponent)
+    app.add_component(ExpensiveComponent)
+
+    def api_key(key: ApiKey):
+        return key
+
+    @app.get("/")
+    @RateLimit(0.01, burst=1, key=api_key)
+    async def handler(key: ApiKey, expensive: Expensive):
+        return text("{} {}".format(key, expensive))
+
+    def get(key=None):
+        headers = {"X-Api-Key": key} if key else {}
+        request, response = app.test_client.get("/", headers=headers)
+        return response.status
+
+    assert [get("a"), get("a"), get("b"), get("a")] == [200, 429, 200, 429]
+    assert ExpensiveComponent.resolved == 2  # not for throttled requests
+    assert [get(), get()] == [200, 200]  # no key, no limit
+
+
+def test_rate_limit_buckets():
+    limit = RateLimit(1, burst=2, compact_interval=10.5)
+    assert limit.take("a", now=100.0) == 0
+    assert limit.take("a", now=100.0) == 0
+    assert limit.take("a", now=100.0) == 1.0
+    assert limit.take("a", now=101.0) == 0  # refilled
+    assert limit.take("b", now=110.0) == 0
+    assert len(limit.buckets) == 2
+
+    limit.take("c", now=110.5)  # compaction first: "a" is full again
+    assert sorted(limit.buckets.slots) == ["b", "c"]
+    assert limit.take("b", now=110.5) == 0
+    assert limit.rejected == 1
+
+
+def test_rate_limit_shared_buckets():
+    limit = RateLimit(1, burst=1, shared=True, slots=16)
+    assert limit.take(("user", 1), now=10.0) == 0
+    assert limit.take(("user", 1), now=10.5) == 0.5
+    assert limit.take(("user", 2), now=10.5) == 0
+    assert len(limit.buckets) == 2
+    assert limit.take(("user", 1), now=11.5) == 0
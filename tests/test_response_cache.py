@@ -0,0 +1,257 @@
+import asyncio
+
+import aiohttp
+from sanic.response import json, text
+
+from sanic_boom import cache_response, coalesce_requests
+
+
+def test_response_cache(app):
+    calls = []
+
+    @app.get("/items/:item_id")
+    @cache_response(ttl=60, query_args=("page",), vary=("Accept-Language",))
+    async def handler(request, item_id):
+        calls.append(item_id)
+        return json({"item": item_id, "page": request.args.get("page")})
+
+    request, response = app.test_client.get("/items/1?page=1&foo=1")
+    assert response.json == {"item": "1", "page": "1"}
+    assert response.headers["Vary"] == "Accept-Language"
+    etag = response.headers["ETag"]
+    assert len(calls) == 1
+
+    # irrelevant query args don't matter
+    request, response = app.test_client.get("/items/1?foo=2&page=1")
+    assert response.status == 200
+    assert response.json == {"item": "1", "page": "1"}
+    assert response.headers["ETag"] == etag
+    assert response.headers["Content-Type"] == "application/json"
+    assert len(calls) == 1
+
+    request, response = app.test_client.get(
+        "/items/1?page=1", headers={"If-None-Match": 'W/"x", ' + etag}
+    )
+    assert response.status == 304
+    assert response.headers["ETag"] == etag
+    assert response.text == ""
+    assert len(calls) == 1
+
+    app.test_client.get("/items/2?page=1")
+    app.test_client.get("/items/1?page=2")
+    app.test_client.get(
+        "/items/1?page=1", headers={"Accept-Language": "pt-BR"}
+    )
+    assert calls == ["1", "2", "1", "1"]
+    assert len(app.response_cache.entries) == 4
+
+    app.response_cache.clear()
+    request, response = app.test_client.get(
+        "/items/1?page=1", headers={"If-None-Match": etag}
+    )
+    assert response.status == 304
+    assert len(calls) == 5
+
+
+def test_response_cache_skipped(app):
+    calls = []
+
+    @app.route("/things", methods=["GET", "POST"])
+    @cache_response(ttl=0)
+    async def handler(request):
+        calls.append(request.method)
+        if request.args.get("fail"):
+            return text("fail", status=500)
+        return text("OK")
+
+    app.test_client.post("/things")
+    app.test_client.post("/things")
+    app.test_client.get("/things?fail=1")
+    app.test_client.get("/things?fail=1")
+    assert app.response_cache.entries == {}
+
+    app.test_client.get("/things")
+    app.test_client.get("/things")  # expired right away
+    assert calls == ["POST", "POST", "GET", "GET", "GET", "GET"]
+    assert len(app.response_cache.entries) == 1
+    assert app.router.find_route_by_view_name("handler")[1].fast_path is None
+
+
+def test_response_cache_hosts(app):
+    @app.get("/tenant", host="*.example.com")
+    @cache_response(ttl=60)
+    async def tenant_handler(request):
+        return text(request.host)
+
+    @app.get("/site", host=["a.com", "b.com"])
+    @cache_response(ttl=60)
+    async def site_handler(request):
+        return text(request.host)
+
+    for host in ("a.example.com", "b.example.com", "A.example.com:8000"):
+        request, response = app.test_client.get(
+            "/tenant", headers={"Host": host}
+        )
+        assert response.status == 200
+        # the last one is the same as the first
+        assert response.text == host.replace("A", "a").replace(":8000", "")
+
+    for host in ("a.com", "b.com", "a.com"):
+        request, response = app.test_client.get(
+            "/site", headers={"Host": host}
+        )
+        assert response.status == 200
+        assert response.text == host
+
+    assert len(app.response_cache.entries) == 4
+
+
+def test_coalesce_requests(app):
+    calls = []
+
+    @app.get("/slow/:item_id")
+    @coalesce_requests(query_args=("page",))
+    async def handler(request, item_id):
+        calls.append(item_id)
+        await asyncio.sleep(0.1)
+        if item_id == "fail":
+            raise ValueError("oops")
+        return text("{} {}".format(item_id, request.args.get("page")))
+
+    @app.get("/fan-out")
+    async def fan_out_handler(request):
+        port = request.transport.get_extra_info("sockname")[1]
+
+        async def fetch(session, path):
+            url = "http://127.0.0.1:{}{}".format(port, path)
+            async with session.get(url) as response:
+                return response.status, await response.text()
+
+        paths = ["/slow/1?page=1"] * 3 + ["/slow/1?page=2", "/slow/2"]
+        paths += ["/slow/fail"] * 2
+        async with aiohttp.ClientSession() as session:
+            responses = await asyncio.gather(
+                *[fetch(session, path) for path in paths]
+            )
+        return json(responses)
+
+    request, response = app.test_client.get("/fan-out")
+    assert response.json[:5] == [
+        [200, "1 1"],
+        [200, "1 1"],
+        [200, "1 1"],
+        [200, "1 2"],
+        [200, "2 None"],
+    ]
+    assert [r[0] for r in response.json[5:]] == [500, 500]
+    assert sorted(calls) == ["1", "1", "2", "fail"]
+    assert app._in_flight == {}
+
+
+def test_coalesce_requests_hosts(app):
+    calls = []
+
+    @app.get("/tenant", host="*.example.com")
+    @coalesce_requests()
+    async def tenant_handler(request):
+        calls.append(request.host)
+        await asyncio.sleep(0.1)
+        return text(request.host)
+
+    @app.get("/site", host=["a.com", "b.com"])
+    @coalesce_requests()
+    async def site_handler(request):
+        calls.append(request.host)
+        await asyncio.sleep(0.1)
+        return text(request.host)
+
+    @app.get("/fan-out")
+    async def fan_out_handler(request):
+        port = request.transport.get_extra_info("sockname")[1]
+
+        async def fetch(session, path, host):
+            url = "http://127.0.0.1:{}{}".format(port, path)
+            headers = {"Host": host}
+            async with session.get(url, headers=headers) as response:
+                return response.status, await response.text()
+
+        requests = [("/tenant", "a.example.com")] * 2
+        requests += [("/tenant", "b.example.com"), ("/site", "a.com")]
+        requests += [("/site", "b.com")]
+        async with aiohttp.ClientSession() as session:
+            responses = await asyncio.gather(
+                *[fetch(session, path, host) for path, host in requests]
+            )
+        return json(responses)
+
+    request, response = app.test_client.get("/fan-out")
+    assert response.json == [
+        [200, "a.example.com"],
+        [200, "a.example.com"],
+        [200, "b.example.com"],
+        [200, "a.com"],
+        [200, "b.com"],
+    ]
+    assert sorted(calls) == [
+        "a.com",
+        "a.example.com",
+        "b.com",
+        "b.example.com",
+    ]
+    assert app._in_flight == {}
+
+
+def test_coalesce_requests_not_shared(app):
+    calls = []
+
+    @app.get("/session")
+    @coalesce_requests()
+    async def session_handler(request):
+        user = request.headers["X-U"]
+        calls.append(user)
+        await asyncio.sleep(0.1)
+        response = text(user)
+        response.cookies["session"] = "secret-{}".format(user)
+        return response
+
+    @app.get("/links")
+    @coalesce_requests()
+    async def links_handler(request):
+        calls.append("links")
+        await asyncio.sleep(0.1)
+        response = text("links")
+        response.headers.add("Link", "</a>; rel=preload")
+        response.headers.add("Link", "</b>; rel=preload")
+        return response
+
+    @app.get("/fan-out")
+    async def fan_out_handler(request):
+        port = request.transport.get_extra_info("sockname")[1]
+
+        async def fetch(session, path, user):
+            url = "http://127.0.0.1:{}{}".format(port, path)
+            async with session.get(url, headers={"X-U": user}) as response:
+                return [
+                    await response.text(),
+                    response.headers.getall("Set-Cookie", []),
+                    response.headers.getall("Link", []),
+                ]
+
+        requests = [("/session", "alice"), ("/session", "bob")]
+        requests += [("/links", "alice"), ("/links", "bob")]
+        async with aiohttp.ClientSession() as session:
+            responses = await asyncio.gather(
+                *[fetch(session, path, user) for path, user in requests]
+            )
+        return json(responses)
+
+    request, response = app.test_client.get("/fan-out")
+    (alice, bob, links, other_links) = response.json
+    assert alice[0] == "alice"
+    assert "session=secret-alice" in alice[1][0]
+    assert bob[0] == "bob"
+    assert "session=secret-bob" in bob[1][0]
+    # the links handler was called once, with both headers shared
+    assert links == other_links
+    assert links[2] == ["</a>; rel=preload", "</b>; rel=preload"]
+    assert sorted(calls) == ["alice", "bob", "links"]
@@ -1,3 +1,6 @@
+import gc
+import uuid
+
 import pytest
 from sanic.blueprints import Blueprint
 from sanic.constants import HTTP_METHODS
@@ -5,6 +8,8 @@ from sanic.exceptions import URLBuildError
 from sanic.response import text
 from sanic.router import RouteExists
 
+from sanic_boom import SanicBoom
+
 
 @pytest.mark.parametrize("method", HTTP_METHODS)
 def test_versioned_routes_get(app, method):
@@ -395,3 +400,539 @@ def test_url_for_various_arguments(app):
 
     with pytest.raises(ValueError):
         app.url_for("handler", _scheme="https")
+
+
+def test_url_template(app):
+    @app.get("/users/:user_id/files/*path")
+    async def handler(request):  # noqa
+        pass
+
+    _, route = app.router.find_route_by_view_name("handler")
+    assert route.template.segments == ["/users/", "/files/", ""]
+    assert route.template.params == [("user_id", False), ("path", True)]
+    assert route.template.names == {"user_id", "path"}
+
+    assert (
+        app.url_for("handler", user_id="john doe", path="a b/c.txt")
+        == "/users/john%20doe/files/a%20b/c.txt"
+    )
+    assert (
+        app.url_for("handler", user_id="a/b", path="c")
+        == "/users/a%2Fb/files/c"
+    )
+
+
+def test_urls_for(app):
+    app.config.SERVER_NAME = "example.tld"
+
+    @app.get("/items/:id")
+    async def handler(request):  # noqa
+        pass
+
+    assert app.urls_for("handler", [{"id": 1}, {"id": 2, "page": 3}]) == [
+        "/items/1",
+        "/items/2?page=3",
+    ]
+    assert app.urls_for(
+        "handler", ({"id": i} for i in range(2)), _external=True
+    ) == ["http://example.tld/items/0", "http://example.tld/items/1"]
+    assert app.urls_for("handler", []) == []
+
+    with pytest.raises(URLBuildError):
+        app.urls_for("handler", [{"id": 1}, {"page": 1}])
+
+    with pytest.raises(URLBuildError):
+        app.urls_for("foobarbaz", [{"id": 1}])
+
+
+def test_host_routing(app):
+    @app.get("/", host="example.com")
+    async def example_handler(request):
+        return text("example")
+
+    @app.get("/", host=["foo.tld", "bar.tld:8000"])
+    async def foobar_handler(request):
+        return text("foobar")
+
+    @app.get("/", host="*.tenant.tld")
+    async def tenant_handler(request):
+        return text("tenant")
+
+    @app.get("/", host="*.vip.tenant.tld")
+    async def vip_tenant_handler(request):
+        return text("vip")
+
+    @app.get("/")
+    async def default_handler(request):
+        return text("default")
+
+    @app.get("/only-default")
+    async def only_default_handler(request):
+        return text("only default")
+
+    for host, expected in (
+        ("example.com", "example"),
+        ("EXAMPLE.com:8000", "example"),
+        ("foo.tld", "foobar"),
+        ("bar.tld:8000", "foobar"),
+        ("acme.tenant.tld", "tenant"),
+        ("acme.vip.tenant.tld", "vip"),
+        ("tenant.tld", "default"),
+        ("unknown.tld", "default"),
+    ):
+        request, response = app.test_client.get("/", headers={"Host": host})
+        assert response.status == 200
+        assert response.text == expected
+
+    request, response = app.test_client.get(
+        "/only-default", headers={"Host": "acme.tenant.tld"}
+    )
+    assert response.text == "only default"
+
+    assert app.router.get_supported_methods("/", host="foo.tld") == {"GET"}
+
+
+def test_host_routing_layered_middlewares(app):
+    @app.middleware(uri="/")
+    async def global_middleware(request):
+        request["global"] = True
+
+    @app.middleware(uri="/", host="example.com")
+    async def host_middleware(request):
+        request["host"] = True
+
+    @app.get("/", host="example.com")
+    async def example_handler(request):
+        return text("example")
+
+    @app.get("/", host="other.com")
+    async def other_handler(request):
+        return text("other")
+
+    request, response = app.test_client.get(
+        "/", headers={"Host": "example.com"}
+    )
+    assert response.text == "example"
+    assert request["global"] is True
+    assert request["host"] is True
+
+    request, response = app.test_client.get("/", headers={"Host": "other.com"})
+    assert response.text == "other"
+    assert request["global"] is True
+    assert "host" not in request
+
+
+def test_url_for_host(app):
+    @app.get("/foo", host="example.com")
+    async def handler(request):  # noqa
+        pass
+
+    assert app.url_for("handler") == "/foo"
+    assert app.url_for("handler", _external=True) == "http://example.com/foo"
+
+
+def test_typed_route_parameters(app):
+    app.router.add_converter("upper", r"[A-Z]+", str.lower)
+
+    @app.get("/items/:item_id<int>/:slug<slug>")
+    async def item_handler(item_id, slug):
+        assert isinstance(item_id, int)
+        return text("{} {}".format(item_id + 1, slug))
+
+    @app.get("/users/:user_id<uuid>")
+    async def user_handler(user_id):
+        assert isinstance(user_id, uuid.UUID)
+        return text(str(user_id))
+
+    @app.get("/codes/:code<[a-z]{3}>/:name<upper>")
+    async def code_handler(code, name):
+        return text("{} {}".format(code, name))
+
+    request, response = app.test_client.get("/items/41/my-item")
+    assert response.status == 200
+    assert response.text == "42 my-item"
+    assert request.uri_template == "/items/:item_id<int>/:slug<slug>"
+
+    request, response = app.test_client.get("/items/abc/my-item")
+    assert response.status == 404
+
+    request, response = app.test_client.get("/items/41/Not_A_Slug")
+    assert response.status == 404
+
+    user_id = uuid.uuid4()
+    request, response = app.test_client.get("/users/{}".format(user_id))
+    assert response.status == 200
+    assert response.text == str(user_id)
+
+    request, response = app.test_client.get("/users/42")
+    assert response.status == 404
+
+    request, response = app.test_client.get("/codes/abc/FOO")
+    assert response.status == 200
+    assert response.text == "abc foo"
+
+    request, response = app.test_client.get("/codes/abcd/FOO")
+    assert response.status == 404
+
+    assert app.url_for("item_handler", item_id=1, slug="foo") == "/items/1/foo"
+
+
+def test_typed_route_parameters_fall_through(app):
+    @app.get("/items/:item_id<int>")
+    async def item_handler(item_id):
+        return text("item {}".format(item_id))
+
+    @app.get("/items/*rest")
+    async def items_handler(rest):
+        return text("rest {}".format(rest))
+
+    @app.get("/users/:user_id<int>", host="example.com")
+    async def host_user_handler(user_id):
+        return text("host {}".format(user_id))
+
+    @app.get("/users/:name")
+    async def user_handler(name):
+        return text("user {}".format(name))
+
+    request, response = app.test_client.get("/items/42")
+    assert response.text == "item 42"
+
+    request, response = app.test_client.get("/items/abc")
+    assert response.status == 200
+    assert response.text == "rest abc"
+    assert request.uri_template == "/items/*rest"
+
+    headers = {"Host": "example.com"}
+    request, response = app.test_client.get("/users/42", headers=headers)
+    assert response.text == "host 42"
+
+    request, response = app.test_client.get("/users/abc", headers=headers)
+    assert response.status == 200
+    assert response.text == "user abc"  # from the default tree
+
+
+def test_freeze(app):
+    @app.middleware
+    async def request_middleware(request):  # noqa
+        pass
+
+    @app.get("/")
+    async def handler(request):
+        return text("OK")
+
+    app.freeze()
+    plan = app.resolver.compile(handler)
+    assert plan is app.resolver.compile(handler)
+    assert [param.name for param, _, _ in plan] == ["request"]
+
+    request, response = app.test_client.get("/")
+    assert response.status == 200
+
+
+def test_freeze_before_fork(app):
+    async def route_middleware(request):
+        pass
+
+    @app.get("/items/:item_id<int>")
+    async def handler(request, item_id):
+        return text(str(item_id))
+
+    app.register_middleware(route_middleware, uri="/items")
+
+    app.freeze(gc_freeze=True)
+    try:
+        # everything workers would otherwise compute on their first request
+        # is computed and out of the garbage collector reach, so it is shared
+        # with them (copy-on-write)
+        assert route_middleware in app.resolver._plans
+        assert handler in app.resolver._plans
+        if hasattr(gc, "get_freeze_count"):
+            assert gc.get_freeze_count() > 0
+            plans = app.resolver._plans
+            assert all(obj is not plans for obj in gc.get_objects())
+    finally:
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()
+
+    request, response = app.test_client.get("/items/42")
+    assert response.text == "42"
+
+
+def test_method_not_allowed_cached(app):
+    @app.route("/foo", methods=["GET", "POST"])
+    async def handler(request):  # noqa
+        return text("OK")
+
+    for _ in range(2):
+        request, response = app.test_client.put("/foo")
+        assert response.status == 405
+        assert response.headers["Allow"] == "GET, POST"
+
+    assert app.router.get_supported_methods("/foo/") == {"GET", "POST"}
+
+
+def test_automatic_options(app):
+    @app.middleware
+    async def request_middleware(request):
+        raise Exception("should not run")
+
+    @app.route("/foo", methods=["GET", "POST"])
+    async def handler(request):  # noqa
+        return text("OK")
+
+    request, response = app.test_client.options("/foo")
+    assert response.status == 500  # disabled by default, middlewares run
+
+    app.config.BOOM_AUTO_OPTIONS = True
+    request, response = app.test_client.options("/foo")
+    assert response.status == 204
+    assert response.headers["Allow"] == "GET, OPTIONS, POST"
+    assert "Access-Control-Allow-Origin" not in response.headers
+
+
+def test_explicit_options_handler(app):
+    app.config.BOOM_AUTO_OPTIONS = True
+
+    @app.options("/bar")
+    async def options_handler(request):
+        return text("explicit")
+
+    request, response = app.test_client.options("/bar")
+    assert response.status == 200
+    assert response.text == "explicit"
+
+    request, response = app.test_client.options("/baz")
+    assert response.status == 404
+
+
+def test_cors_preflight(app):
+    app.config.BOOM_AUTO_OPTIONS = True
+    app.config.BOOM_CORS_ORIGINS = "https://example.com, https://foo.tld"
+    app.config.BOOM_CORS_MAX_AGE = 600
+
+    @app.route("/foo", methods=["GET", "POST"])
+    async def handler(request):  # noqa
+        return text("OK")
+
+    headers = {
+        "Origin": "https://foo.tld",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "X-Foo",
+    }
+    request, response = app.test_client.options("/foo", headers=headers)
+    assert response.status == 204
+    assert response.headers["Access-Control-Allow-Origin"] == "https://foo.tld"
+    assert response.headers["Access-Control-Allow-Methods"] == (
+        "GET, OPTIONS, POST"
+    )
+    assert response.headers["Access-Control-Allow-Headers"] == "X-Foo"
+    assert response.headers["Access-Control-Max-Age"] == "600"
+    assert response.headers["Vary"] == "Origin"
+
+    headers["Origin"] = "https://evil.tld"
+    request, response = app.test_client.options("/foo", headers=headers)
+    assert response.status == 204
+    assert "Access-Control-Allow-Origin" not in response.headers
+
+    app.config.BOOM_CORS_ORIGINS = ["*"]
+    headers["Access-Control-Request-Method"] = "DELETE"
+    request, response = app.test_client.options("/foo", headers=headers)
+    assert "Access-Control-Allow-Origin" not in response.headers
+
+    headers["Access-Control-Request-Method"] = "GET"
+    request, response = app.test_client.options("/foo", headers=headers)
+    assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+
+def test_swap_router(app):
+    @app.get("/foo")
+    async def foo_handler(request):
+        return text("foo")
+
+    @app.get("/bar")
+    async def bar_handler(request):
+        return text("bar")
+
+    request, response = app.test_client.get("/foo")
+    assert response.text == "foo"
+    request, response = app.test_client.get("/bar")
+    assert response.text == "bar"
+    old_table = app.router._table
+
+    router = app.router.clone()
+
+    async def baz_handler(request):
+        return text("baz")
+
+    router.add("/baz", ["GET"], baz_handler)
+    assert app.url_for("foo_handler") == "/foo"
+    with pytest.raises(URLBuildError):
+        app.url_for("baz_handler")
+
+    assert app.router.swap(router) == set()
+    assert app.router._table is not old_table
+    # a route was added, so everything is looked up again
+    assert not app.router._table.cache
+    assert app.url_for("baz_handler") == "/baz"
+
+    request, response = app.test_client.get("/baz")
+    assert response.text == "baz"
+    request, response = app.test_client.get("/foo")
+    assert response.text == "foo"
+    request, response = app.test_client.get("/bar")
+    assert response.text == "bar"
+
+    # only removing routes keeps the lookups of the others
+    old_table = app.router._table
+    router = app.router.clone(exclude=lambda item: item.handler is baz_handler)
+    assert {i.handler for i in app.router.swap(router)} == {baz_handler}
+    assert set(app.router._table.cache) == set(old_table.cache) - {
+        ("/baz", "GET", None)
+    }
+
+
+def test_swap_router_more_specific_routes(app):
+    @app.get("/files/*path")
+    async def files_handler(request, path):
+        return text("files {}".format(path))
+
+    @app.get("/foo")
+    async def foo_handler(request):
+        return text("foo")
+
+    request, response = app.test_client.get("/files/readme")
+    assert response.text == "files readme"
+    headers = {"Host": "a.com"}
+    request, response = app.test_client.get("/foo", headers=headers)
+    assert response.text == "foo"
+
+    async def readme_handler(request):
+        return text("readme")
+
+    async def host_foo_handler(request):
+        return text("a.com foo")
+
+    router = app.router.clone()
+    router.add("/files/readme", ["GET"], readme_handler)
+    router.add("/foo", ["GET"], host_foo_handler, host="a.com")
+    app.swap_router(router)
+
+    request, response = app.test_client.get("/files/readme")
+    assert response.text == "readme"
+    request, response = app.test_client.get("/files/other")
+    assert response.text == "files other"
+    request, response = app.test_client.get("/foo", headers=headers)
+    assert response.text == "a.com foo"
+    request, response = app.test_client.get("/foo")
+    assert response.text == "foo"
+
+
+def test_remove_route(app):
+    @app.get("/foo")
+    async def foo_handler(request):
+        return text("foo")
+
+    @app.get("/bar/")
+    async def bar_handler(request):
+        return text("bar")
+
+    request, response = app.test_client.get("/bar")
+    assert response.status == 200
+    assert foo_handler in app.resolver._plans
+
+    app.remove_route("bar/")
+
+    request, response = app.test_client.get("/bar")
+    assert response.status == 404
+    assert bar_handler not in app.resolver._plans
+    request, response = app.test_client.get("/foo")
+    assert response.status == 200
+
+    with pytest.raises(URLBuildError):
+        app.url_for("bar_handler")
+
+    with pytest.warns(RuntimeWarning):
+        app.remove_route("/bar")
+
+
+def test_remove_route_plans(app):
+    def make_handler(name):
+        async def handler(request):
+            return text(name)
+
+        return handler
+
+    for i in range(3):
+        handler = make_handler(str(i))
+        app.route("/temp/{}".format(i), name="temp_{}".format(i))(handler)
+        request, response = app.test_client.get("/temp/{}".format(i))
+        assert response.text == str(i)
+        assert handler in app.resolver._plans
+
+        # the component cache is kept, but not the plans
+        app.remove_route("/temp/{}".format(i), clean_cache=False)
+        assert handler not in app.resolver._plans
+
+
+def test_catch_all_routes(app):
+    @app.middleware(uri="/files")
+    async def files_middleware(request):
+        request["files"] = True
+
+    @app.get("/files/*path")
+    async def files_handler(request, path):
+        return text("files {}".format(path))
+
+    @app.post("/files/*path")
+    async def files_post_handler(request, path):
+        return text("post {}".format(path))
+
+    @app.get("/files/static")
+    async def static_handler(request):
+        return text("static")
+
+    @app.get("/docs/:name/info")
+    async def info_handler(request, name):
+        return text("info {}".format(name))
+
+    @app.get("/*rest")
+    async def fallback_handler(request, rest):
+        return text("fallback {}".format(rest))
+
+    @app.get("/other")
+    async def other_handler(request):
+        return text("other")
+
+    for url, expected, layered in (
+        ("/files/static", "static", True),
+        ("/docs/foo/info", "info foo", False),
+        ("/docs/foo/bar", "fallback docs/foo/bar", False),
+        ("/files/foo/bar.txt", "files foo/bar.txt", True),
+        ("/files/", "files ", True),
+        ("/files", "files ", True),
+        ("/other", "other", False),
+        ("/filesystem/foo", "fallback filesystem/foo", False),
+        ("/", "fallback ", False),
+    ):
+        request, response = app.test_client.get(url)
+        assert response.status == 200
+        assert response.text == expected
+        assert request.get("files", False) is layered
+
+    request, response = app.test_client.post("/files/foo")
+    assert response.text == "post foo"
+
+    request, response = app.test_client.post("/files/static")
+    assert response.text == "post static"
+
+    request, response = app.test_client.put("/files/foo")
+    assert response.status == 405
+    assert response.headers["Allow"] == "GET, POST"
+
+    assert app.url_for("files_handler", path="a/b.txt") == "/files/a/b.txt"
+
+    with pytest.raises(RouteExists):
+
+        @app.get("/files/*other")
+        async def clashing_handler(request):  # noqa
+            pass
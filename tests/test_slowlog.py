@@ -0,0 +1,60 @@
+import inspect
+
+from sanic.response import text
+
+from sanic_boom import Component, ComponentCache
+
+
+class Number:
+    pass
+
+
+class NumberComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Number
+
+    def get_cache_lifecycle(self):
+        return ComponentCache.REQUEST
+
+    async def get(self):
+        return 42
+
+
+def test_slow_log(app):
+    app.config.BOOM_SLOW_REQUEST_THRESHOLD = 0
+    app.enable_slow_log(size=2, uri="/_slow")
+    app.add_component(NumberComponent)
+
+    @app.middleware(uri="/numbers")
+    async def layered_request_middleware(request, number: Number):
+        pass
+
+    @app.get("/numbers/:value")
+    async def handler(value, number: Number):
+        return text(str(number))
+
+    request, response = app.test_client.get("/numbers/1")
+    assert response.text == "42"
+
+    entry = app.slow_log.entries[-1]
+    assert entry["uri_template"] == "/numbers/:value"
+    assert entry["status"] == 200
+    assert entry["duration"] >= sum(s["duration"] for s in entry["stages"])
+    assert "handler" in [s["name"] for s in entry["stages"]]
+    assert [(c["cache"], c["stage"]) for c in entry["components"]] == [
+        ("miss", "layered_request_middleware"),
+        ("hit", "resolve"),
+    ]
+    assert entry["components"][0]["component"] == "NumberComponent"
+    assert entry["components"][0]["lifecycle"] == "REQUEST"
+
+    request, response = app.test_client.get("/_slow")
+    assert response.status == 200
+    assert len(response.json) == 1  # the log itself is logged after
+    assert response.json[0]["uri_template"] == "/numbers/:value"
+    assert app.slow_log.entries[-1]["uri_template"] == "/_slow"
+
+    app.slow_log.threshold = 60
+    app.test_client.get("/numbers/1")
+    assert len(app.slow_log.entries) == 2
+    assert app.slow_log.entries[-1]["uri_template"] == "/_slow"
@@ -0,0 +1,120 @@
+import inspect
+
+from sanic.response import text
+
+from sanic_boom import Component, Tracer
+
+
+class Traces(Tracer):
+    def __init__(self):
+        self.started = 0
+        self.traces = []
+
+    def on_start(self, trace, request):
+        self.started += 1
+
+    def on_finish(self, trace, request, response):
+        self.traces.append(trace)
+
+
+class BrokenTracer(Tracer):
+    def on_start(self, trace, request):
+        raise Exception("oops")
+
+    def on_finish(self, trace, request, response):
+        raise Exception("oops")
+
+
+class Number:
+    pass
+
+
+class NumberComponent(Component):
+    def resolve(self, param: inspect.Parameter) -> bool:
+        return param.annotation == Number
+
+    async def get(self):
+        return 42
+
+
+def test_tracing_stages(app):
+    traces = Traces()
+    app.add_tracer(traces)
+    app.add_tracer(BrokenTracer())
+    app.add_component(NumberComponent)
+
+    @app.middleware(uri="/")
+    async def layered_request_middleware(request):
+        pass
+
+    @app.middleware(uri="/", attach_to="response")
+    async def layered_response_middleware(request, response):
+        pass
+
+    @app.get("/numbers/:value")
+    async def handler(value, number: Number):
+        return text(str(number))
+
+    request, response = app.test_client.get("/numbers/1")
+    assert response.text == "42"
+    assert traces.started == 1
+    trace = traces.traces[-1]
+
+    assert trace is request.trace
+    assert trace.uri_template == "/numbers/:value"
+    assert trace.span.attributes["status"] == 200
+    assert trace.span.attributes["method"] == "GET"
+    assert [s.name for s in trace.stages] == [
+        "request_middleware",  # from the test client
+        "routing",
+        "layered_request_middleware",
+        "resolve",
+        "handler",
+        "layered_response_middleware",
+        "write",
+    ]
+    for span in trace.spans:
+        assert span.duration >= 0
+        assert trace.span.start <= span.start <= span.end <= trace.span.end
+
+
+def test_tracing_fast_path_and_errors(app):
+    traces = Traces()
+    app.add_tracer(traces)
+
+    @app.get("/")
+    async def handler(request):
+        return text("OK")
+
+    @app.get("/error")
+    async def error_handler(request):
+        raise ValueError
+
+    request, response = app.test_client.get("/")
+    assert [s.name for s in traces.traces[-1].stages] == [
+        "request_middleware",
+        "routing",
+        "handler",
+        "write",
+    ]
+
+    request, response = app.test_client.get("/error")
+    assert response.status == 500
+    assert traces.traces[-1].span.attributes["exception"] == "ValueError"
+    assert traces.traces[-1].span.attributes["status"] == 500
+
+    app.config.BOOM_AUTO_OPTIONS = True
+    request, response = app.test_client.options("/")
+    assert response.status == 204
+    assert traces.traces[-1].stages == []
+    assert traces.traces[-1].span.attributes["status"] == 204
+
+
+def test_no_tracing(app):
+    @app.get("/")
+    async def handler(request):
+        return text("OK")
+
+    request, response = app.test_client.get("/")
+    assert response.status == 200
+    assert request.trace is None